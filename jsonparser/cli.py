@@ -0,0 +1,188 @@
+import argparse
+import sys
+import time
+from pprint import pformat
+from typing import IO, Any, Iterator, List, Optional, Tuple
+from jsonparser.encoder import EncodeError, dumps
+from jsonparser.parser import ParseError, PointerError, iter_lines, parse
+from jsonparser.parser import iter_texts, resolve, split_pointer, validate
+from jsonparser.pipeline import run_parallel
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None  # type: ignore
+
+# Results are (ok, line); a line of None means the record printed nothing.
+Result = Tuple[bool, Optional[str]]
+
+
+class Job:
+    def __init__(
+        self, select: Optional[str], compact: bool, validate_only: bool
+    ) -> None:
+        self.select = select
+        self.compact = compact
+        self.validate_only = validate_only
+
+    def one(self, text: str) -> Result:
+        if self.validate_only:
+            ok, offset = validate(text)
+            if ok:
+                return (True, None)
+            return (False, "invalid JSON at offset %d" % offset)
+        try:
+            val, left = parse(text)
+            if left.strip(" \r\t\n"):
+                raise ParseError("unexpected `%s' after value" % left)
+            if self.select is not None:
+                val = resolve(val, self.select)
+        except PointerError:
+            return (True, None)
+        except ParseError as e:
+            return (False, str(e))
+        if self.compact:
+            try:
+                return (True, dumps(val))
+            except EncodeError as e:
+                return (False, str(e))
+        return (True, pformat(val))
+
+    def __call__(self, texts: List[str]) -> List[Result]:
+        return [self.one(text) for text in texts]
+
+
+class CountingReader:
+    def __init__(self, fp: IO[bytes]) -> None:
+        self.fp = fp
+        self.count = 0
+
+    def read(self, n: int = -1) -> bytes:
+        # read1() returns whatever a pipe has ready instead of blocking
+        # until a whole chunk has arrived.
+        read = getattr(self.fp, "read1", self.fp.read)
+        data = read(n)
+        self.count += len(data)
+        return data
+
+    def __iter__(self) -> Iterator[bytes]:
+        for line in self.fp:
+            self.count += len(line)
+            yield line
+
+
+def peak_memory() -> Optional[float]:
+    if resource is None:
+        return None
+    peak = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    # Linux reports kilobytes, macOS bytes.
+    return peak / (1024.0 * 1024.0 if sys.platform == "darwin" else 1024.0)
+
+
+def arguments(argv: Optional[List[str]]) -> argparse.Namespace:
+    p = argparse.ArgumentParser(
+        prog="jsonparser",
+        description="Parse a stream of concatenated or NDJSON records.",
+    )
+    p.add_argument("files", nargs="*", help="input files, default stdin")
+    p.add_argument(
+        "--ndjson",
+        action="store_true",
+        help="one record per input line; write one compact record per line",
+    )
+    p.add_argument(
+        "-c", "--compact", action="store_true", help="write compact JSON"
+    )
+    p.add_argument(
+        "--select", metavar="PATH", help="print the JSON pointer PATH only"
+    )
+    p.add_argument(
+        "--validate-only",
+        action="store_true",
+        help="only report records that are not well-formed",
+    )
+    p.add_argument(
+        "-w", "--workers", type=int, default=0, help="parallel processes"
+    )
+    p.add_argument(
+        "--batch", type=int, default=256, help="records per worker task"
+    )
+    p.add_argument(
+        "--stats", action="store_true", help="print throughput to stderr"
+    )
+    args = p.parse_args(argv)
+    if args.select is not None:
+        try:
+            split_pointer(args.select)
+        except PointerError as e:
+            p.error(str(e))
+    return args
+
+
+def main(
+    argv: Optional[List[str]] = None,
+    stdin: Optional[IO[bytes]] = None,
+    stdout: Optional[IO[str]] = None,
+    stderr: Optional[IO[str]] = None,
+) -> int:
+    args = arguments(argv)
+    out = stdout if stdout else sys.stdout
+    err = stderr if stderr else sys.stderr
+    job = Job(args.select, args.compact or args.ndjson, args.validate_only)
+    readers: List[CountingReader] = []
+
+    def inputs() -> Iterator[str]:
+        sources: List[Any] = args.files or [None]
+        for path in sources:
+            fp = stdin if stdin else sys.stdin.buffer
+            if path is not None:
+                fp = open(path, "rb")
+            try:
+                reader = CountingReader(fp)
+                readers.append(reader)
+                if args.ndjson:
+                    yield from iter_lines(reader)
+                else:
+                    yield from iter_texts(reader)
+            finally:
+                if path is not None:
+                    fp.close()
+
+    t0 = time.perf_counter()
+    if args.workers > 1:
+        results = run_parallel(job, inputs(), args.workers, args.batch)
+    else:
+        results = (job.one(text) for text in inputs())
+
+    status = 0
+    records = 0
+    for ok, line in results:
+        records += 1
+        if not ok:
+            err.write("record %d: %s\n" % (records, line))
+            status = 1
+        elif line is not None:
+            out.write(line)
+            out.write("\n")
+    out.flush()
+
+    if args.stats:
+        elapsed = max(time.perf_counter() - t0, 1e-9)
+        nbytes = sum(r.count for r in readers)
+        peak = peak_memory()
+        err.write(
+            "%d records, %d bytes in %.3f s: %.1f records/s, %.2f MB/s, "
+            "peak memory %s\n"
+            % (
+                records,
+                nbytes,
+                elapsed,
+                records / elapsed,
+                nbytes / elapsed / 1e6,
+                "%.1f MB" % peak if peak is not None else "unknown",
+            )
+        )
+    return status
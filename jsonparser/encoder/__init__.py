@@ -0,0 +1 @@
+from .encoder import Encoder, EncodeError, dump, dumps, encode_string
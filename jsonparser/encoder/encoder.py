@@ -0,0 +1,134 @@
+import math
+import re
+from typing import Any, Callable, Dict, IO, List, Optional
+
+_needsescape = re.compile(r'["\\\x00-\x1f]')
+_esctab = {
+    '"': '\\"',
+    "\\": "\\\\",
+    "\b": "\\b",
+    "\f": "\\f",
+    "\n": "\\n",
+    "\r": "\\r",
+    "\t": "\\t",
+}
+for _c in range(0x20):
+    _esctab.setdefault(chr(_c), "\\u%04x" % _c)
+
+
+class EncodeError(Exception):
+    def __init__(self, msg: str) -> None:
+        super().__init__("JSON encoding error: %s" % msg)
+
+
+def encode_string(s: str) -> str:
+    if not _needsescape.search(s):
+        return '"' + s + '"'
+    return '"' + _needsescape.sub(lambda m: _esctab[m.group()], s) + '"'
+
+
+class Encoder:
+    def __init__(
+        self,
+        chunk_size: int = 65536,
+        key_cache_size: int = 4096,
+        default: Optional[Callable[[Any], Any]] = None,
+    ) -> None:
+        self.chunk_size = chunk_size
+        self.key_cache_size = key_cache_size
+        self.default = default
+        self.keys: Dict[str, str] = {}
+        self.out: List[str] = []
+        self.size = 0
+        self.fp: Optional[IO[str]] = None
+
+    def key(self, k: Any) -> str:
+        enc = self.keys.get(k)
+        if enc is None:
+            if not isinstance(k, str):
+                raise EncodeError("object key %r is not a string" % (k,))
+            enc = encode_string(k) + ":"
+            if len(self.keys) < self.key_cache_size:
+                self.keys[k] = enc
+        return enc
+
+    def write(self, s: str) -> None:
+        self.out.append(s)
+        self.size += len(s)
+
+    def flush(self) -> None:
+        if self.fp is not None and self.out:
+            self.fp.write("".join(self.out))
+            self.out = []
+            self.size = 0
+
+    def encode(self, obj: Any) -> None:
+        write = self.write
+        if isinstance(obj, str):
+            write(encode_string(obj))
+        elif obj is None:
+            write("null")
+        elif obj is True:
+            write("true")
+        elif obj is False:
+            write("false")
+        elif isinstance(obj, int):
+            write(int.__repr__(obj))
+        elif isinstance(obj, float):
+            if not math.isfinite(obj):
+                raise EncodeError("%r is not representable" % obj)
+            write(float.__repr__(obj))
+        elif isinstance(obj, dict):
+            write("{")
+            sep = ""
+            for k, v in obj.items():
+                write(sep)
+                write(self.key(k))
+                self.encode(v)
+                sep = ","
+            write("}")
+        elif isinstance(obj, (list, tuple)) or hasattr(obj, "__next__"):
+            write("[")
+            sep = ""
+            for v in obj:
+                write(sep)
+                self.encode(v)
+                sep = ","
+            write("]")
+        elif self.default is not None:
+            self.encode(self.default(obj))
+        else:
+            raise EncodeError("cannot encode %s" % type(obj).__name__)
+        if self.size >= self.chunk_size:
+            self.flush()
+
+    def dump(self, obj: Any, fp: IO[str]) -> None:
+        self.fp = fp
+        try:
+            self.encode(obj)
+            self.flush()
+        finally:
+            self.fp = None
+            self.out = []
+            self.size = 0
+
+    def dumps(self, obj: Any) -> str:
+        try:
+            self.encode(obj)
+            return "".join(self.out)
+        finally:
+            self.out = []
+            self.size = 0
+
+
+def dumps(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> str:
+    return Encoder(default=default).dumps(obj)
+
+
+def dump(
+    obj: Any,
+    fp: IO[str],
+    chunk_size: int = 65536,
+    default: Optional[Callable[[Any], Any]] = None,
+) -> None:
+    Encoder(chunk_size=chunk_size, default=default).dump(obj, fp)
@@ -0,0 +1,84 @@
+import io
+import json
+import unittest
+from jsonparser.encoder import *
+from jsonparser.parser import parse
+
+
+class CountingWriter(io.StringIO):
+    def __init__(self) -> None:
+        super().__init__()
+        self.writes = 0
+
+    def write(self, s: str) -> int:
+        self.writes += 1
+        return super().write(s)
+
+
+class TestEncoder(unittest.TestCase):
+    def test_scalars(self):
+        for v, exp in (
+            (None, "null"),
+            (True, "true"),
+            (False, "false"),
+            (12, "12"),
+            (-0.5, "-0.5"),
+            (1e16, "1e+16"),
+            ("abc", '"abc"'),
+            ("Δ", '"Δ"'),
+        ):
+            self.assertEqual(dumps(v), exp)
+
+    def test_escape(self):
+        s = 'q"b\\s\n\t\x01/'
+        self.assertEqual(dumps(s), json.dumps(s, ensure_ascii=False))
+        self.assertEqual(parse(dumps(s))[0], s)
+
+    def test_containers(self):
+        v = {"a": [1, 2.5, {"b": None}], "c": (), "d": {}}
+        self.assertEqual(dumps(v), '{"a":[1,2.5,{"b":null}],"c":[],"d":{}}')
+
+    def test_iterators(self):
+        self.assertEqual(dumps({"sq": (i * i for i in range(4))}),
+                         '{"sq":[0,1,4,9]}')
+        self.assertEqual(dumps(iter("ab")), '["a","b"]')
+
+    def test_roundtrip(self):
+        v = {
+            "ints": [0, -1, 123456789],
+            "floats": [0.1, -2.5e-7, 1.7976931348623157e308, 5e-324, -0.0],
+            "text": ["", "plain", "tab\there", "Δé"],
+            "nested": [[{"x": [True, False, None]}]],
+        }
+        out, left = parse(dumps(v))
+        self.assertEqual(left, "")
+        self.assertEqual(out, v)
+        for f in v["floats"]:
+            self.assertEqual(repr(parse(dumps(f))[0]), repr(f))
+
+    def test_roundtrip_types(self):
+        v = [0, -7, 2**63 + 1, -(10**400), 1.0, -0.5, 1e300, 5e-324, 2.0**70]
+        out, left = parse(dumps(v), integers=True)
+        self.assertEqual(left, "")
+        self.assertEqual([repr(x) for x in out], [repr(x) for x in v])
+        self.assertEqual([type(x) for x in out], [type(x) for x in v])
+        self.assertEqual(parse("12", integers=True)[0], 12)
+        self.assertIs(type(parse("12")[0]), float)
+
+    def test_dump_chunks(self):
+        v = [{"key": "value %d" % i} for i in range(1000)]
+        fp = CountingWriter()
+        dump(v, fp, chunk_size=256)
+        self.assertEqual(fp.getvalue(), dumps(v))
+        self.assertGreater(fp.writes, 10)
+
+    def test_key_cache(self):
+        e = Encoder(key_cache_size=2)
+        e.dumps([{"a": 1, "b": 2, "c": 3}, {"a": 4}])
+        self.assertEqual(e.keys, {"a": '"a":', "b": '"b":'})
+
+    def test_errors(self):
+        for v in (float("nan"), float("inf"), {1: 2}, object()):
+            with self.assertRaises(EncodeError):
+                dumps(v)
+        self.assertEqual(dumps({"s": {1, 2}}, default=sorted), '{"s":[1,2]}')
@@ -7,5 +7,37 @@ from .parser import (
     MatchBool,
     MatchNull,
     parse,
+    parse_many_threaded,
+    Parser,
     Error,
+    ParseError,
+    Limits,
+    LimitExceeded,
+    Kind,
+    ParseStats,
 )
+from .tape import Tape, TapeError, parse_tape
+from .columnar import MatchColumns, parse_columnar
+from .schema import (
+    ArrayOf,
+    Field,
+    MatchArrayOf,
+    MatchRecord,
+    Record,
+    Schema,
+    SchemaError,
+    compile_schema,
+    parse_schema,
+)
+from .validate import validate
+from .stream import (
+    Splitter,
+    aiter_values,
+    iter_lines,
+    iter_texts,
+    iter_values,
+    parse_stream,
+)
+from .spans import Document, Span, SpanRecorder, build_spans
+from .pointer import PointerError, resolve, split_pointer
+from .positions import PositionTable, parse_positions
@@ -0,0 +1,95 @@
+from array import array
+from typing import Any, Dict, List, Optional, Tuple, Union
+from jsonparser.primitives import Combinable, MatchAll, MatchCharacter
+from .parser import Helpers, MatchArray, MatchObject, ParseError
+
+Column = Union["array[float]", List[Any]]
+
+
+class Heterogeneous(Exception):
+    pass
+
+
+class MatchColumns(Combinable):
+    openmatch = MatchAll(Helpers.wsmatch, MatchCharacter("["), Helpers.wsmatch)
+    rowmatch = MatchAll(Helpers.wsmatch, MatchCharacter("{"), Helpers.wsmatch)
+    itemmatch = MatchAll(*MatchObject.itemmatch)
+    sepmatch = MatchAll(Helpers.wsmatch, MatchCharacter(","), Helpers.wsmatch)
+    rowend = MatchAll(Helpers.wsmatch, MatchCharacter("}"))
+    arrayend = MatchAll(Helpers.wsmatch, MatchCharacter("]"))
+
+    def parse(self, what: str) -> Optional[Tuple[Any, str]]:
+        r = self.openmatch.parse(what)
+        if not r:
+            return None
+        _, left = r
+        try:
+            return self.columns(left)
+        except Heterogeneous:
+            return MatchArray().parse(what)
+
+    def row(
+        self, what: str, rows: int, keys: List[str], cols: Dict[str, Column]
+    ) -> str:
+        r = self.rowmatch.parse(what)
+        if not r:
+            raise Heterogeneous()
+        _, left = r
+        first = not keys
+        seen = 0
+        while True:
+            r = self.itemmatch.parse(left)
+            if not r:
+                break
+            vals, left = r
+            key, val = vals[0], vals[4]
+            if first:
+                if key in cols:
+                    raise Heterogeneous()
+                keys.append(key)
+                cols[key] = array("d") if type(val) is float else []
+            elif key not in cols:
+                raise Heterogeneous()
+            col = cols[key]
+            if len(col) != rows:
+                raise Heterogeneous()
+            if isinstance(col, array) and type(val) is not float:
+                col = cols[key] = list(col)
+            col.append(val)
+            seen += 1
+            r = self.sepmatch.parse(left)
+            if not r:
+                break
+            _, left = r
+        r = self.rowend.parse(left)
+        # Rows without keys would leave no column to count them by.
+        if not r or seen != len(keys) or not keys:
+            raise Heterogeneous()
+        return r[1]
+
+    def columns(self, what: str) -> Tuple[Any, str]:
+        keys: List[str] = []
+        cols: Dict[str, Column] = {}
+        rows = 0
+        left = what
+        while True:
+            r = self.arrayend.parse(left)
+            if r:
+                return (cols, r[1])
+            left = self.row(left, rows, keys, cols)
+            rows += 1
+            r = self.sepmatch.parse(left)
+            if r:
+                _, left = r
+            elif not self.arrayend.parse(left):
+                raise Heterogeneous()
+
+
+def parse_columnar(what: str) -> Tuple[Any, str]:
+    try:
+        r = MatchColumns().parse(what)
+        if not r:
+            raise ParseError("parsing `%s' failed " % what)
+        return r
+    except Exception as e:
+        raise ParseError("parsing `%s' failed: %s" % (what, e))
@@ -1,6 +1,5 @@
 from jsonparser.primitives import (
     Combinable,
-    MatchOneOrMore,
     MatchZeroOrMore,
     MatchCharacter,
     MatchAny,
@@ -11,7 +10,11 @@ from jsonparser.primitives import (
     MatchEnd,
     MatchOrRaise as _MatchOrRaise,
 )
-from typing import Dict, List, Any, Tuple, Optional
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Dict, List, Any, Tuple, Optional, Callable, Iterable
 
 
 class Error(Exception):
@@ -19,6 +22,12 @@ class Error(Exception):
         super().__init__("JSON: %s (``%s'')" % (msg, context))
 
 
+class LimitExceeded(Error):
+    def __init__(self, limit: str, value: Any, context: str) -> None:
+        msg = "%s limit of %s exceeded" % (limit, value)
+        super().__init__(msg, context[:40])
+
+
 def MatchOrRaise(matcher: Combinable, msg: str) -> Combinable:
     def E(msg: str, ctx: str) -> Error:
         return Error(msg, ctx)
@@ -26,24 +35,209 @@ def MatchOrRaise(matcher: Combinable, msg: str) -> Combinable:
     return _MatchOrRaise(matcher, E, msg)
 
 
+ObjectHook = Callable[[Dict[str, Any]], Any]
+PairsHook = Callable[[List[Tuple[str, Any]]], Any]
+ArrayHook = Callable[[List[Any]], Any]
+
+
+class Kind:
+    OBJECT, ARRAY, STRING, NUMBER, BOOL, NULL = range(6)
+
+
+class Limits:
+    # Any limit left as None is not enforced. Lengths are in characters of
+    # the source text, except max_bytes which counts UTF-8 encoded input.
+    def __init__(
+        self,
+        max_bytes: Optional[int] = None,
+        max_nodes: Optional[int] = None,
+        max_depth: Optional[int] = None,
+        max_string: Optional[int] = None,
+        max_number: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.max_nodes = max_nodes
+        self.max_depth = max_depth
+        self.max_string = max_string
+        self.max_number = max_number
+        self.timeout = timeout
+
+
+class ParseStats:
+    # Totals accumulate over every parse the collector is given, so one
+    # instance can summarize a whole stream of documents. A document that
+    # fails to parse adds nothing. String sizes are UTF-8 bytes of the
+    # decoded values, and object keys are counted as strings too. Not safe
+    # to share between threads.
+    blankmatch = re.compile(r'"(?:[^"\\]|\\.)*"|([ \r\t\n]+)')
+
+    def __init__(self) -> None:
+        self.documents = 0
+        self.objects = 0
+        self.arrays = 0
+        self.strings = 0
+        self.numbers = 0
+        self.bools = 0
+        self.nulls = 0
+        self.max_depth = 0
+        self.string_bytes = 0
+        self.max_string_bytes = 0
+        self.whitespace = 0
+        self.keys: Counter = Counter()
+
+    def string(self, s: str) -> None:
+        n = len(s.encode("utf-8"))
+        self.strings += 1
+        self.string_bytes += n
+        if n > self.max_string_bytes:
+            self.max_string_bytes = n
+
+    def document(self, used: str) -> None:
+        # Whitespace between tokens, found in one scan that steps over the
+        # strings; whitespace inside strings is not counted.
+        self.documents += 1
+        self.whitespace += sum(map(len, self.blankmatch.findall(used)))
+
+    def merge(self, other: "ParseStats") -> None:
+        self.documents += other.documents
+        self.objects += other.objects
+        self.arrays += other.arrays
+        self.strings += other.strings
+        self.numbers += other.numbers
+        self.bools += other.bools
+        self.nulls += other.nulls
+        self.max_depth = max(self.max_depth, other.max_depth)
+        self.string_bytes += other.string_bytes
+        self.max_string_bytes = max(
+            self.max_string_bytes, other.max_string_bytes
+        )
+        self.whitespace += other.whitespace
+        self.keys.update(other.keys)
+
+
+class ParseContext:
+    # The clock is only consulted every this many nodes.
+    clockevery = 256
+    wsmatch = re.compile(r"[ \r\t\n]*")
+
+    def __init__(
+        self,
+        object_hook: Optional[ObjectHook] = None,
+        object_pairs_hook: Optional[PairsHook] = None,
+        array_hook: Optional[ArrayHook] = None,
+        spans: Any = None,
+        end: int = 0,
+        limits: Optional[Limits] = None,
+        stats: Optional[ParseStats] = None,
+        integers: bool = False,
+    ) -> None:
+        self.object_hook = object_hook
+        self.object_pairs_hook = object_pairs_hook
+        self.array_hook = array_hook
+        self.spans = spans
+        self.end = end
+        self.limits = limits
+        self.stats = stats
+        self.integers = integers
+        self.nesting = bool(limits) or stats is not None
+        self.nodes = 0
+        self.depth = 0
+        self.deadline = None
+        if limits and limits.timeout is not None:
+            self.deadline = time.monotonic() + limits.timeout
+
+    def count(self, what: str) -> None:
+        self.nodes += 1
+        limits = self.limits
+        if limits.max_nodes is not None and self.nodes > limits.max_nodes:
+            raise LimitExceeded("node count", limits.max_nodes, what)
+        if self.deadline is not None and not self.nodes % self.clockevery:
+            self.clock(what)
+
+    def clock(self, what: str) -> None:
+        if time.monotonic() > self.deadline:
+            raise LimitExceeded("time", self.limits.timeout, what)
+
+    def nest(self, what: str, opener: str) -> bool:
+        i = self.wsmatch.match(what).end()
+        if what[i : i + 1] != opener:
+            return False
+        limits = self.limits
+        if (
+            limits
+            and limits.max_depth is not None
+            and self.depth >= limits.max_depth
+        ):
+            raise LimitExceeded("nesting depth", limits.max_depth, what[i:])
+        self.depth += 1
+        if self.stats is not None and self.depth > self.stats.max_depth:
+            self.stats.max_depth = self.depth
+        return True
+
+    def span(self, kind: int, what: str, ws: Any, left: str, n: int) -> None:
+        # Offsets are derived from the lengths of the remaining text, with
+        # any leading whitespace the matcher skipped excluded from the span.
+        start = self.end - len(what) + (len(ws) if ws else 0)
+        self.spans.record(kind, start, self.end - len(left), n)
+
+    def object(self, pairs: List[Tuple[str, Any]]) -> Any:
+        if self.object_pairs_hook:
+            return self.object_pairs_hook(pairs)
+        if self.object_hook:
+            return self.object_hook(dict(pairs))
+        return dict(pairs)
+
+    def array(self, res: List[Any]) -> Any:
+        if self.array_hook:
+            return self.array_hook(res)
+        return res
+
+
+# Per-call parse state lives here rather than on the shared grammar objects.
+_context: ContextVar[Optional[ParseContext]] = ContextVar(
+    "jsonparser_context", default=None
+)
+
+
 class MatchValue(Combinable):
-    matchers: List[Combinable] = []
+    # Rebound rather than mutated so that readers always see a complete
+    # tuple, even while another thread registers a matcher.
+    matchers: Tuple[Combinable, ...] = ()
 
     @classmethod
     def add_matcher(self, matcher: Combinable):
-        self.matchers.append(matcher)
+        self.matchers = self.matchers + (matcher,)
 
     def parse(self, what: str) -> Optional[Tuple[Any, str]]:
         if len(what) == 0:
             return None
-        return MatchAny(*self.matchers).parse(what)
+        for matcher in self.matchers:
+            res = matcher.parse(what)
+            if res:
+                ctx = _context.get()
+                if ctx and ctx.limits:
+                    ctx.count(what)
+                return res
+        return None
+
+
+class MatchWhitespace(Combinable):
+    # Consumes a whole run with a single slice instead of one per character.
+    match = re.compile(r"[ \r\t\n]*")
+
+    def parse(self, what: str) -> Optional[Tuple[Any, str]]:
+        n = self.match.match(what).end()
+        if n:
+            return (what[:n], what[n:])
+        return (None, what)
 
 
 class Helpers:
     class GUARD:
         pass
 
-    wsmatch = MatchZeroOrMore(MatchCharacter(" \r\t\n"))
+    wsmatch = MatchWhitespace()
 
 
 class MatchDelimiter(Combinable):
@@ -69,58 +263,91 @@ class MatchString(Combinable):
         "r": "\r",
         "t": "\t",
     }
+    # Runs without quotes or escapes are copied with one slice each, so
+    # decoding stays linear in the length of the string.
+    plainmatch = re.compile(r'[^"\\]*')
+    hexmatch = re.compile(r"[0-9a-fA-F]{4}")
 
     def parse(self, what: str) -> Optional[Tuple[Any, str]]:
-        if what[0] != '"' or len(what) < 2:
+        if what[:1] in (" ", "\t", "\r", "\n"):
+            _, what = Helpers.wsmatch.parse(what)
+        if what[:1] != '"' or len(what) < 2:
             return None
-        result = ""
-        escaped = False
-        try:
-            i = 1
-            while i < len(what):
-                c = what[i]
-                if c == '"' and not escaped:
-                    return (result, what[i + 1 :])
-                elif c == "\\" and not escaped:
-                    escaped = True
-                elif escaped:
-                    escaped = False
-                    if c in self.esctab:
-                        result += self.esctab[c]
-                    elif c == "u":
-                        cp = what[i + 1 : i + 1 + 4]
-                        try:
-                            result += chr(int(cp, 16))
-                        except ValueError:
-                            raise Error("invalid codepoint", cp)
-                        i += 4
-                    else:
-                        raise Error("unidentified escape", c)
-                else:
-                    result += c
-                i += 1
-        except IndexError:
-            raise Error("abrupt end of string", what)
+        pieces: List[str] = []
+        stop = len(what)
+        ctx = _context.get()
+        if ctx and ctx.limits and ctx.limits.max_string is not None:
+            stop = min(stop, ctx.limits.max_string + 2)
+        clock = ctx is not None and ctx.deadline is not None
+        i = 1
+        escapes = 0
+        while True:
+            j = self.plainmatch.match(what, i, stop).end()
+            if j > i:
+                pieces.append(what[i:j])
+                i = j
+            if i >= stop:
+                break
+            if what[i] == '"':
+                result = "".join(pieces)
+                left = what[i + 1 :]
+                if ctx:
+                    if ctx.spans is not None:
+                        ctx.span(Kind.STRING, what, None, left, 0)
+                    if ctx.stats is not None:
+                        ctx.stats.string(result)
+                return (result, left)
+            if i + 1 >= stop:
+                break
+            c = what[i + 1]
+            if c in self.esctab:
+                pieces.append(self.esctab[c])
+                i += 2
+            elif c == "u":
+                cp = what[i + 2 : i + 6]
+                if not self.hexmatch.fullmatch(cp):
+                    raise Error("invalid codepoint", cp)
+                pieces.append(chr(int(cp, 16)))
+                i += 6
+            else:
+                raise Error("unidentified escape", c)
+            escapes += 1
+            if clock and not escapes % ctx.clockevery:
+                ctx.clock(what)
+        if stop < len(what):
+            raise LimitExceeded("string length", ctx.limits.max_string, what)
         return None
 
 
 class MatchNumber(Combinable):
-    nummatch = MatchOneOrMore(MatchCharacter("0123456789"))
+    nummatch = re.compile(r"[0-9]+")
 
     def parse(self, what: str) -> Optional[Tuple[Any, str]]:
-        _, what = Helpers.wsmatch.parse(what)
+        ws, what = Helpers.wsmatch.parse(what)
+        ctx = _context.get()
+        r = self.number(what, ctx is not None and ctx.integers)
+        if r and ctx:
+            if ctx.limits and ctx.limits.max_number is not None:
+                if len(what) - len(r[1]) > ctx.limits.max_number:
+                    raise LimitExceeded(
+                        "number length", ctx.limits.max_number, what
+                    )
+            if ctx.spans is not None:
+                ctx.span(Kind.NUMBER, what, None, r[1], 0)
+            if ctx.stats is not None:
+                ctx.stats.numbers += 1
+        return r
 
+    def number(
+        self, what: str, integers: bool = False
+    ) -> Optional[Tuple[Any, str]]:
         # The implementation here is pretty naive and mostly
         # unnecessarily constructs the string-to-be-atof'd.
         def match_num_chars(where: str) -> str:
-            ret = ""
-            res = self.nummatch.parse(where)
+            res = self.nummatch.match(where)
             if not res:
                 raise Error("expecting digits", what)
-            n, left = res
-            for nc in n:
-                ret += nc
-            return ret
+            return res.group()
 
         try:
             read: int = 0
@@ -139,35 +366,60 @@ class MatchNumber(Combinable):
             else:
                 return None
 
-            if read >= len(what):
-                return (sign * float(num), what[read:])
-            if what[read] == ".":
+            exact = True
+            if read < len(what) and what[read] == ".":
+                exact = False
                 num += "."
                 read += 1
                 after = match_num_chars(what[read:])
                 read += len(after)
                 num += after
-                if read > len(what):
-                    raise Error("number missing decimal part", what)
-            if read >= len(what):
-                return (sign * float(num), what[read:])
-            if what[read] in "eE":
+            if read < len(what) and what[read] in "eE":
+                exact = False
                 read += 1
-                expsign = 1
+                expsign = ""
                 if what[read] == "+":
                     read += 1
-                    expsign = 1
                 elif what[read] == "-":
                     read += 1
-                    expsign = -1
+                    expsign = "-"
                 exp = match_num_chars(what[read:])
                 read += len(exp)
-                res = sign * float(num) * (10 ** (expsign * float(exp)))
-                return (res, what[read:])
-            return (sign * float(num), what[read:])
+                num = "%se%s%s" % (num, expsign, exp)
         except (IndexError, EndOfText):
             raise Error("abrupt end of number", what)
 
+        if exact and integers:
+            return (sign * int(num), what[read:])
+        # Let float() scale by any exponent so that the result is correctly
+        # rounded, but do not let a literal too large for a float turn into
+        # an infinity that no encoder will write back.
+        res = float(num)
+        if res == float("inf"):
+            raise Error("number out of range", what)
+        return (sign * res, what[read:])
+
+
+def MatchItems(item: Combinable) -> Combinable:
+    # Matches `item (, item)* ,?' so that every item, including the last
+    # one, is parsed exactly once. A trailing comma is tolerated.
+    return MatchOrDefault(
+        MatchAll(
+            item,
+            MatchZeroOrMore(
+                MatchAll(
+                    Helpers.wsmatch,
+                    MatchCharacter(","),
+                    Helpers.wsmatch,
+                    item,
+                )
+            ),
+            Helpers.wsmatch,
+            MatchOrDefault(MatchCharacter(","), None),
+        ),
+        Helpers.GUARD,
+    )
+
 
 class MatchObject(Combinable):
     itemmatch = [
@@ -181,71 +433,78 @@ class MatchObject(Combinable):
         Helpers.wsmatch,
         MatchCharacter("{"),
         Helpers.wsmatch,
-        MatchZeroOrMore(
-            MatchAll(
-                Helpers.wsmatch,
-                *itemmatch,
-                Helpers.wsmatch,
-                MatchCharacter(","),
-            )
-        ),
-        Helpers.wsmatch,
-        MatchOrDefault(MatchAll(*itemmatch), Helpers.GUARD),
+        MatchItems(MatchAll(*itemmatch)),
         Helpers.wsmatch,
         MatchOrRaise(MatchCharacter("}"), "expecting closing '}'"),
     )
 
     def parse(self, what: str) -> Optional[Tuple[Any, str]]:
-        kv: Dict[str, Any] = {}
+        pairs: List[Tuple[str, Any]] = []
+        ctx = _context.get()
+        nested = ctx is not None and ctx.nesting and ctx.nest(what, "{")
         try:
             r = self.match.parse(what)
             if not r:
                 return None
             vals, left = r
-            if vals[3]:
-                for val in vals[3]:
-                    kv[val[1]] = val[5]
-            if vals[5] != Helpers.GUARD:
-                val = vals[5]
-                kv[val[0]] = val[4]
-            return (kv, left)
+            if vals[3] != Helpers.GUARD:
+                first, rest, _, _ = vals[3]
+                pairs.append((first[0], first[4]))
+                if rest:
+                    for val in rest:
+                        pairs.append((val[3][0], val[3][4]))
+            if ctx:
+                if ctx.spans is not None:
+                    ctx.span(Kind.OBJECT, what, vals[0], left, len(pairs))
+                if ctx.stats is not None:
+                    ctx.stats.objects += 1
+                    ctx.stats.keys.update(k for k, _ in pairs)
+                return (ctx.object(pairs), left)
+            return (dict(pairs), left)
         except EndOfText:
             raise Error("sudden end of text when parsing object", what)
+        finally:
+            if nested:
+                ctx.depth -= 1
 
 
 class MatchArray(Combinable):
     match = MatchAll(
         Helpers.wsmatch,
         MatchCharacter("["),
-        MatchZeroOrMore(
-            MatchAll(
-                Helpers.wsmatch,
-                MatchValue(),
-                Helpers.wsmatch,
-                MatchCharacter(","),
-            )
-        ),
         Helpers.wsmatch,
-        MatchOrDefault(MatchValue(), Helpers.GUARD),
+        MatchItems(MatchValue()),
         Helpers.wsmatch,
         MatchOrRaise(MatchCharacter("]"), "expecting closing ']'"),
     )
 
     def parse(self, what: str) -> Optional[Tuple[Any, str]]:
         res: List[Any] = []
+        ctx = _context.get()
+        nested = ctx is not None and ctx.nesting and ctx.nest(what, "[")
         try:
             r = self.match.parse(what)
             if not r:
                 return None
             vals, left = r
-            if vals[2]:
-                for val in vals[2]:
-                    res.append(val[1])
-            if vals[4] != Helpers.GUARD:
-                res.append(vals[4])
+            if vals[3] != Helpers.GUARD:
+                first, rest, _, _ = vals[3]
+                res.append(first)
+                if rest:
+                    for val in rest:
+                        res.append(val[3])
+            if ctx:
+                if ctx.spans is not None:
+                    ctx.span(Kind.ARRAY, what, vals[0], left, len(res))
+                if ctx.stats is not None:
+                    ctx.stats.arrays += 1
+                return (ctx.array(res), left)
             return (res, left)
         except EndOfText:
             raise Error("sudden end of text when parsing array", what)
+        finally:
+            if nested:
+                ctx.depth -= 1
 
 
 class MatchBool(Combinable):
@@ -268,6 +527,11 @@ class MatchBool(Combinable):
             res = True
         else:
             res = False
+        ctx = _context.get()
+        if ctx and ctx.spans is not None:
+            ctx.span(Kind.BOOL, what, v[0], left, 0)
+        if ctx and ctx.stats is not None:
+            ctx.stats.bools += 1
         return (res, left)
 
 
@@ -280,7 +544,12 @@ class MatchNull(Combinable):
         r = self.match.parse(what)
         if not r:
             return None
-        _, left = r
+        v, left = r
+        ctx = _context.get()
+        if ctx and ctx.spans is not None:
+            ctx.span(Kind.NULL, what, v[0], left, 0)
+        if ctx and ctx.stats is not None:
+            ctx.stats.nulls += 1
         return (None, left)
 
 
@@ -289,14 +558,127 @@ class ParseError(Exception):
         super().__init__("JSON parsing error: %s" % msg)
 
 
-def parse(what: str) -> Optional[Tuple[Any, str]]:
-    try:
-        r = MatchValue().parse(what)
-        if not r:
-            raise ParseError("parsing `%s' failed " % what)
-        return r
-    except Exception as e:
-        raise ParseError("parsing `%s' failed: %s" % (what, e))
+class Parser:
+    #
+    # The grammar objects are shared by every parser and never modified
+    # after import. A Parser only holds options and cannot be changed once
+    # built; everything a single call needs goes into a fresh ParseContext.
+    # Parsers can therefore be used from any number of threads at once.
+    #
+    __slots__ = (
+        "object_hook",
+        "object_pairs_hook",
+        "array_hook",
+        "limits",
+        "integers",
+    )
+    object_hook: Optional[ObjectHook]
+    object_pairs_hook: Optional[PairsHook]
+    array_hook: Optional[ArrayHook]
+    limits: Optional[Limits]
+    integers: bool
+
+    def __init__(
+        self,
+        object_hook: Optional[ObjectHook] = None,
+        object_pairs_hook: Optional[PairsHook] = None,
+        array_hook: Optional[ArrayHook] = None,
+        limits: Optional[Limits] = None,
+        integers: bool = False,
+    ) -> None:
+        object.__setattr__(self, "object_hook", object_hook)
+        object.__setattr__(self, "object_pairs_hook", object_pairs_hook)
+        object.__setattr__(self, "array_hook", array_hook)
+        object.__setattr__(self, "limits", limits)
+        object.__setattr__(self, "integers", integers)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("Parser is immutable")
+
+    def context(
+        self, what: str, spans: Any, stats: Optional[ParseStats]
+    ) -> Optional[ParseContext]:
+        if (
+            self.object_hook
+            or self.object_pairs_hook
+            or self.array_hook
+            or self.limits
+            or self.integers
+            or spans is not None
+            or stats is not None
+        ):
+            return ParseContext(
+                self.object_hook,
+                self.object_pairs_hook,
+                self.array_hook,
+                spans,
+                len(what),
+                self.limits,
+                stats,
+                self.integers,
+            )
+        return None
+
+    def check_size(self, what: str) -> None:
+        limit = self.limits.max_bytes
+        if limit is None or len(what) * 4 <= limit:
+            return
+        if len(what) > limit or len(what.encode("utf-8")) > limit:
+            raise LimitExceeded("input size", limit, what)
+
+    def parse(
+        self,
+        what: str,
+        spans: Any = None,
+        stats: Optional[ParseStats] = None,
+    ) -> Optional[Tuple[Any, str]]:
+        if self.limits:
+            self.check_size(what)
+        # Counts go to a scratch collector first, so that the caller's
+        # collector only sees documents that parsed.
+        scratch = ParseStats() if stats is not None else None
+        token = _context.set(self.context(what, spans, scratch))
+        try:
+            r = MatchValue().parse(what)
+            if not r:
+                raise ParseError("parsing `%s' failed " % what)
+            if scratch is not None:
+                scratch.document(what[: len(what) - len(r[1])])
+                stats.merge(scratch)
+            return r
+        except LimitExceeded:
+            raise
+        except Exception as e:
+            raise ParseError("parsing `%s' failed: %s" % (what, e))
+        finally:
+            _context.reset(token)
+
+
+def parse(
+    what: str,
+    object_hook: Optional[ObjectHook] = None,
+    object_pairs_hook: Optional[PairsHook] = None,
+    array_hook: Optional[ArrayHook] = None,
+    limits: Optional[Limits] = None,
+    stats: Optional[ParseStats] = None,
+    spans: Any = None,
+    integers: bool = False,
+) -> Optional[Tuple[Any, str]]:
+    return Parser(
+        object_hook, object_pairs_hook, array_hook, limits, integers
+    ).parse(what, spans, stats)
+
+
+def parse_many_threaded(
+    whats: Iterable[str],
+    workers: Optional[int] = None,
+    parser: Optional[Parser] = None,
+) -> List[Tuple[Any, str]]:
+    from concurrent.futures import ThreadPoolExecutor
+
+    p = parser if parser else Parser()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(p.parse, whats))
 
 
 MatchValue.add_matcher(MatchObject())
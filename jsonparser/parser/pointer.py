@@ -0,0 +1,37 @@
+import re
+from typing import Any, List
+
+_index = re.compile(r"0|[1-9][0-9]*")
+
+
+class PointerError(Exception):
+    def __init__(self, msg: str, pointer: str) -> None:
+        super().__init__("JSON pointer: %s (``%s'')" % (msg, pointer))
+
+
+def split_pointer(pointer: str) -> List[str]:
+    if pointer == "":
+        return []
+    if pointer[0] != "/":
+        raise PointerError("must start with '/'", pointer)
+    return [
+        t.replace("~1", "/").replace("~0", "~") for t in pointer[1:].split("/")
+    ]
+
+
+def resolve(value: Any, pointer: str) -> Any:
+    for token in split_pointer(pointer):
+        if isinstance(value, dict):
+            if token not in value:
+                raise PointerError("no member `%s'" % token, pointer)
+            value = value[token]
+        elif isinstance(value, (list, tuple)):
+            if not _index.fullmatch(token):
+                raise PointerError("bad array index `%s'" % token, pointer)
+            idx = int(token)
+            if idx >= len(value):
+                raise PointerError("index %d out of range" % idx, pointer)
+            value = value[idx]
+        else:
+            raise PointerError("cannot descend into a scalar", pointer)
+    return value
@@ -0,0 +1,117 @@
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Tuple
+from .parser import Kind, MatchString, Parser
+from .pointer import PointerError
+from .spans import SpanRecorder
+
+
+def _escape(token: str) -> str:
+    return token.replace("~", "~0").replace("/", "~1")
+
+
+class PositionTable(SpanRecorder):
+    #
+    # Pass as spans= to Parser.parse or parse() for the same text. Node ids
+    # are indices into the recorded arrays, which hold every object, array,
+    # key and scalar in post-order. The pointer index and the newline index
+    # are only built when first asked for.
+    #
+    def __init__(self, text: str) -> None:
+        super().__init__()
+        self.text = text
+        self.nodes: Optional[Dict[str, int]] = None
+        self.keys: Dict[str, int] = {}
+        self.paths: Dict[int, str] = {}
+        self.newlines: Optional[array] = None
+
+    def index(self) -> Dict[str, int]:
+        if self.nodes is not None:
+            return self.nodes
+        keymatch = MatchString()
+        members: Dict[int, List[Tuple[int, int]]] = {}
+        stack: List[int] = []
+        for i in range(len(self)):
+            n = self.counts[i]
+            kind = self.kinds[i]
+            if kind == Kind.OBJECT:
+                ids = stack[len(stack) - 2 * n :]
+                del stack[len(stack) - 2 * n :]
+                members[i] = list(zip(ids[0::2], ids[1::2]))
+            elif kind == Kind.ARRAY:
+                ids = stack[len(stack) - n :]
+                del stack[len(stack) - n :]
+                members[i] = [(-1, v) for v in ids]
+            stack.append(i)
+
+        # A repeated key keeps only its last value, as in the parsed
+        # object; the members it shadows are not indexed at all.
+        nodes: Dict[str, int] = {}
+        todo = [("", stack[-1])] if stack else []
+        while todo:
+            path, i = todo.pop()
+            nodes[path] = i
+            self.paths[i] = path
+            children: Dict[str, Tuple[int, int]] = {}
+            for idx, (k, v) in enumerate(members.get(i, ())):
+                if k < 0:
+                    child = "%s/%d" % (path, idx)
+                else:
+                    raw = self.text[self.starts[k] : self.ends[k]]
+                    key = _escape(keymatch.parse(raw)[0])
+                    child = "%s/%s" % (path, key)
+                    children.pop(child, None)
+                children[child] = (k, v)
+            for child, (k, v) in children.items():
+                if k >= 0:
+                    self.keys[child] = k
+            todo.extend((c, v) for c, (_, v) in reversed(children.items()))
+        self.nodes = nodes
+        return nodes
+
+    def node(self, pointer: str) -> int:
+        i = self.index().get(pointer)
+        if i is None:
+            raise PointerError("no such node", pointer)
+        return i
+
+    def key(self, pointer: str) -> int:
+        self.index()
+        i = self.keys.get(pointer)
+        if i is None:
+            raise PointerError("not an object member", pointer)
+        return i
+
+    def pointer(self, node: int) -> str:
+        self.index()
+        return self.paths[node]
+
+    def span(self, pointer: str) -> Tuple[int, int]:
+        i = self.node(pointer)
+        return (self.starts[i], self.ends[i])
+
+    def location(self, offset: int) -> Tuple[int, int]:
+        # One-based line and column, with the column counted in characters.
+        if self.newlines is None:
+            self.newlines = array("q")
+            i = self.text.find("\n")
+            while i >= 0:
+                self.newlines.append(i)
+                i = self.text.find("\n", i + 1)
+        line = bisect_left(self.newlines, offset)
+        begin = self.newlines[line - 1] + 1 if line else 0
+        return (line + 1, offset - begin + 1)
+
+    def start(self, pointer: str) -> Tuple[int, int]:
+        return self.location(self.span(pointer)[0])
+
+    def end(self, pointer: str) -> Tuple[int, int]:
+        return self.location(self.span(pointer)[1])
+
+
+def parse_positions(
+    what: str, parser: Optional[Parser] = None
+) -> Tuple[Any, str, PositionTable]:
+    table = PositionTable(what)
+    val, left = (parser if parser else Parser()).parse(what, spans=table)
+    return (val, left, table)
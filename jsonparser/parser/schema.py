@@ -0,0 +1,250 @@
+import keyword
+import re
+from collections import namedtuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from jsonparser.primitives import Combinable, MatchAll, MatchAny, MatchCharacter
+from .parser import (
+    Error,
+    Helpers,
+    MatchArray,
+    MatchBool,
+    MatchNull,
+    MatchNumber,
+    MatchObject,
+    MatchOrRaise,
+    MatchString,
+    MatchValue,
+    ParseError,
+)
+
+
+class SchemaError(Error):
+    pass
+
+
+class ArrayOf:
+    def __init__(self, kind: Any) -> None:
+        self.kind = kind
+
+
+class Field:
+    def __init__(self, name: str, kind: Any, required: bool = True) -> None:
+        self.name = name
+        self.kind = kind
+        self.required = required
+
+
+class Schema:
+    def __init__(
+        self,
+        name: str,
+        fields: Sequence[Field],
+        namedtuple: bool = False,
+        extra: bool = False,
+    ) -> None:
+        # Field names become attributes of the record class, so they have
+        # to be usable as namedtuple fields and in __slots__.
+        for n in [name] + [f.name for f in fields]:
+            if not n.isidentifier() or keyword.iskeyword(n) or n[0] == "_":
+                raise ValueError("schema %s: bad name `%s'" % (name, n))
+        names = [f.name for f in fields]
+        if len(set(names)) != len(names):
+            raise ValueError("schema %s has duplicate fields" % name)
+        self.name = name
+        self.fields = tuple(fields)
+        self.namedtuple = namedtuple
+        self.extra = extra
+
+
+class Record:
+    __slots__: Tuple[str, ...] = ()
+
+    def __init__(self, *args: Any) -> None:
+        for name, val in zip(self.__slots__, args):
+            setattr(self, name, val)
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(
+            getattr(self, n) == getattr(other, n) for n in self.__slots__
+        )
+
+    def __repr__(self) -> str:
+        return "%s(%s)" % (
+            type(self).__name__,
+            ", ".join(
+                "%s=%r" % (n, getattr(self, n)) for n in self.__slots__
+            ),
+        )
+
+
+class MatchInteger(Combinable):
+    # Only integer literals match; 1.0 and 1e3 are numbers, not integers.
+    intmatch = re.compile(r"[ \r\t\n]*(-?(?:0|[1-9][0-9]*))(?![0-9.eE])")
+
+    def parse(self, what: str) -> Optional[Tuple[Any, str]]:
+        m = self.intmatch.match(what)
+        if not m:
+            return None
+        return (int(m.group(1)), what[m.end() :])
+
+
+class MatchArrayOf(Combinable):
+    openmatch = MatchAll(Helpers.wsmatch, MatchCharacter("["), Helpers.wsmatch)
+    sepmatch = MatchAll(Helpers.wsmatch, MatchCharacter(","), Helpers.wsmatch)
+    endmatch = MatchAll(Helpers.wsmatch, MatchCharacter("]"))
+
+    def __init__(self, matcher: Combinable, desc: str) -> None:
+        self.matcher = matcher
+        self.desc = desc
+
+    def parse(self, what: str) -> Optional[Tuple[Any, str]]:
+        r = self.openmatch.parse(what)
+        if not r:
+            return None
+        _, left = r
+        res: List[Any] = []
+        while True:
+            r = self.endmatch.parse(left)
+            if r:
+                return (res, r[1])
+            r = self.matcher.parse(left)
+            if not r:
+                raise SchemaError("array expects %s" % self.desc, left)
+            val, left = r
+            res.append(val)
+            r = self.sepmatch.parse(left)
+            if r:
+                _, left = r
+            elif not self.endmatch.parse(left):
+                raise Error("expecting closing ']'", left)
+
+
+class MatchRecord(Combinable):
+    MISSING = Helpers.GUARD
+    openmatch = MatchAll(Helpers.wsmatch, MatchCharacter("{"), Helpers.wsmatch)
+    keymatch = MatchString()
+    colonmatch = MatchAll(
+        Helpers.wsmatch,
+        MatchOrRaise(MatchCharacter(":"), "expecting ':'"),
+        Helpers.wsmatch,
+    )
+    sepmatch = MatchAll(Helpers.wsmatch, MatchCharacter(","), Helpers.wsmatch)
+    endmatch = MatchAll(
+        Helpers.wsmatch,
+        MatchOrRaise(MatchCharacter("}"), "expecting closing '}'"),
+    )
+    skipmatch = MatchOrRaise(MatchValue(), "expecting object value")
+
+    def __init__(self, schema: Schema, record: Any) -> None:
+        self.schema = schema
+        self.record = record
+        self.index = {f.name: i for i, f in enumerate(schema.fields)}
+        self.matchers: List[Combinable] = []
+        self.descs: List[str] = []
+
+    def parse(self, what: str) -> Optional[Tuple[Any, str]]:
+        r = self.openmatch.parse(what)
+        if not r:
+            return None
+        _, left = r
+        fields = self.schema.fields
+        vals = [self.MISSING] * len(fields)
+        while left[:1] == '"':
+            key, left = self.keymatch.parse(left)
+            _, left = self.colonmatch.parse(left)
+            idx = self.index.get(key)
+            if idx is None:
+                if not self.schema.extra:
+                    raise SchemaError(
+                        "%s has no field `%s'" % (self.schema.name, key), left
+                    )
+                _, left = self.skipmatch.parse(left)
+            else:
+                if vals[idx] is not self.MISSING:
+                    raise SchemaError("duplicate field `%s'" % key, left)
+                r = self.matchers[idx].parse(left)
+                if not r:
+                    raise SchemaError(
+                        "field `%s' expects %s" % (key, self.descs[idx]), left
+                    )
+                vals[idx], left = r
+            r = self.sepmatch.parse(left)
+            if not r:
+                break
+            _, left = r
+        _, left = self.endmatch.parse(left)
+        for i, f in enumerate(fields):
+            if vals[i] is self.MISSING:
+                if f.required:
+                    raise SchemaError(
+                        "%s is missing field `%s'" % (self.schema.name, f.name),
+                        what,
+                    )
+                vals[i] = None
+        return (self.record(*vals), left)
+
+
+class Compiler:
+    scalars = {
+        str: (MatchString, "string"),
+        int: (MatchInteger, "integer"),
+        float: (MatchNumber, "number"),
+        bool: (MatchBool, "boolean"),
+        dict: (MatchObject, "object"),
+        list: (MatchArray, "array"),
+        object: (MatchValue, "value"),
+    }
+
+    def __init__(self) -> None:
+        self.compiled: Dict[int, MatchRecord] = {}
+
+    def kind(self, kind: Any) -> Tuple[Combinable, str]:
+        if isinstance(kind, Schema):
+            return (self.schema(kind), kind.name)
+        if isinstance(kind, ArrayOf):
+            matcher, desc = self.kind(kind.kind)
+            desc = "array of %s" % desc
+            return (MatchArrayOf(matcher, desc), desc)
+        if kind in self.scalars:
+            cls, desc = self.scalars[kind]
+            return (cls(), desc)
+        raise ValueError("unsupported schema type %r" % (kind,))
+
+    def schema(self, schema: Schema) -> MatchRecord:
+        m = self.compiled.get(id(schema))
+        if m:
+            return m
+        names = [f.name for f in schema.fields]
+        record: Any
+        if schema.namedtuple:
+            record = namedtuple(schema.name, names)  # type: ignore
+        else:
+            record = type(schema.name, (Record,), {"__slots__": tuple(names)})
+        m = MatchRecord(schema, record)
+        self.compiled[id(schema)] = m
+        for f in schema.fields:
+            matcher, desc = self.kind(f.kind)
+            if not f.required:
+                matcher = MatchAny(MatchNull(), matcher)
+                desc = "%s or null" % desc
+            m.matchers.append(matcher)
+            m.descs.append(desc)
+        return m
+
+
+def compile_schema(schema: Schema) -> MatchRecord:
+    return Compiler().schema(schema)
+
+
+def parse_schema(matcher: Combinable, what: str) -> Tuple[Any, str]:
+    try:
+        r = matcher.parse(what)
+        if not r:
+            raise ParseError("parsing `%s' failed " % what)
+        return r
+    except SchemaError:
+        raise
+    except Exception as e:
+        raise ParseError("parsing `%s' failed: %s" % (what, e))
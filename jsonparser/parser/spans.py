@@ -0,0 +1,153 @@
+from array import array
+from typing import Any, List, Optional, Tuple
+from .parser import Kind, MatchString, ParseError, Parser
+
+
+class SpanRecorder:
+    #
+    # Nodes are recorded in post-order as the matchers complete them: first
+    # the children, then their container. Containers store how many members
+    # they have; an object with n members is preceded by n (key, value)
+    # node pairs, an array with n elements by n values.
+    #
+    def __init__(self) -> None:
+        self.kinds = array("B")
+        self.starts = array("q")
+        self.ends = array("q")
+        self.counts = array("q")
+
+    def record(self, kind: int, start: int, end: int, count: int) -> None:
+        self.kinds.append(kind)
+        self.starts.append(start)
+        self.ends.append(end)
+        self.counts.append(count)
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+
+class Span:
+    # Offsets are relative to the start of the parent node, so an edit only
+    # moves the later siblings of each node on the path to the edit.
+    __slots__ = ("kind", "offset", "length", "children", "key")
+
+    def __init__(self, kind: int, offset: int, length: int) -> None:
+        self.kind = kind
+        self.offset = offset
+        self.length = length
+        self.children: List["Span"] = []
+        self.key: Optional[str] = None
+
+
+def build_spans(rec: SpanRecorder, text: str) -> Span:
+    stack: List[Span] = []
+    keymatch = MatchString()
+    for i in range(len(rec)):
+        kind, start, end = rec.kinds[i], rec.starts[i], rec.ends[i]
+        span = Span(kind, start, end - start)
+        n = rec.counts[i]
+        if kind == Kind.OBJECT:
+            members = stack[len(stack) - 2 * n :]
+            del stack[len(stack) - 2 * n :]
+            for k, v in zip(members[0::2], members[1::2]):
+                raw = text[k.offset : k.offset + k.length]
+                v.key = keymatch.parse(raw)[0]
+                span.children.append(v)
+        elif kind == Kind.ARRAY:
+            span.children = stack[len(stack) - n :]
+            del stack[len(stack) - n :]
+        for child in span.children:
+            child.offset -= start
+        stack.append(span)
+    return stack[-1]
+
+
+class Document:
+    parser = Parser()
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.value, self.root = self.parse(text)
+
+    def parse(self, text: str) -> Tuple[Any, Span]:
+        rec = SpanRecorder()
+        val, left = self.parser.parse(text, spans=rec)
+        if left.strip(" \r\t\n"):
+            raise ParseError("unexpected `%s' after value" % left)
+        return (val, build_spans(rec, text))
+
+    def edit(self, offset: int, deleted: int, inserted: str) -> Any:
+        if not 0 <= offset <= offset + deleted <= len(self.text):
+            raise IndexError("edit outside of document")
+        text = self.text[:offset] + inserted + self.text[offset + deleted :]
+        delta = len(inserted) - deleted
+        end = offset + deleted
+
+        # Collect the nodes enclosing the edit, outermost first, together
+        # with their absolute start and their index within the parent.
+        path: List[Tuple[Span, int, int]] = []
+        found = (self.root, self.root.offset, -1)
+        while found:
+            node, start, _ = found
+            if not start <= offset <= end <= start + node.length:
+                break
+            path.append(found)
+            found = None
+            for i, child in enumerate(node.children):
+                if start + child.offset > offset:
+                    break
+                found = (child, start + child.offset, i)
+
+        for depth in range(len(path) - 1, -1, -1):
+            if self.patch(path, depth, text, delta):
+                self.text = text
+                return self.value
+
+        self.value, self.root = self.parse(text)
+        self.text = text
+        return self.value
+
+    def patch(
+        self,
+        path: List[Tuple[Span, int, int]],
+        depth: int,
+        text: str,
+        delta: int,
+    ) -> bool:
+        node, start, _ = path[depth]
+        # A repeated key on the way down could lead into a member other
+        # than the one edited; leave those objects to a wider re-parse.
+        for i in range(depth):
+            step = path[i + 1][0]
+            if step.key is not None:
+                keys = [c.key for c in path[i][0].children]
+                if keys.count(step.key) > 1:
+                    return False
+        try:
+            val, span = self.parse(text[start : start + node.length + delta])
+        except ParseError:
+            return False
+        if span.offset != 0:
+            return False
+
+        if depth == 0:
+            self.value, self.root = val, span
+            span.offset = start
+            return True
+
+        container = self.value
+        for step, _, i in path[1:depth]:
+            container = container[i if step.key is None else step.key]
+        parent, _, _ = path[depth - 1]
+        _, _, idx = path[depth]
+        span.key = node.key
+        span.offset = node.offset
+        container[idx if node.key is None else node.key] = val
+        parent.children[idx] = span
+
+        for i in range(depth):
+            ancestor = path[i][0]
+            ancestor.length += delta
+            for sibling in ancestor.children[path[i + 1][2] + 1 :]:
+                sibling.offset += delta
+        return True
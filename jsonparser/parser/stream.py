@@ -0,0 +1,218 @@
+import codecs
+import functools
+import re
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Iterator,
+    List,
+    Optional,
+    Union,
+)
+from .parser import ParseError, parse
+
+if TYPE_CHECKING:  # pragma: no cover
+    # asyncio takes longer to import than the rest of the package
+    # together, so it is only imported once a coroutine here runs.
+    import asyncio
+
+    # Protocol is newer than the rest of what the package needs.
+    from typing import Protocol
+
+    # Anything with read(), or line iteration, will do, not only files.
+    class Reader(Protocol):
+        def read(self, __n: int = ...) -> Union[str, bytes]:
+            ...
+
+    class Lines(Protocol):
+        def __iter__(self) -> Iterator[Union[str, bytes]]:
+            ...
+
+_nonws = re.compile(r"[^ \t\r\n]")
+_instring = re.compile(r'["\\]')
+_structural = re.compile(r'[{}\[\]"]')
+_scalarend = re.compile(r'[ \t\r\n{}\[\],"]')
+
+IDLE, CONTAINER, STRING, SCALAR = range(4)
+
+
+class Splitter:
+    #
+    # Finds the boundaries of concatenated top-level values in a text that
+    # arrives in chunks. Only brackets, quotes and escapes are tracked; the
+    # values themselves are left for the parser to judge.
+    #
+    def __init__(self) -> None:
+        self.pieces: List[str] = []
+        self.mode = IDLE
+        self.depth = 0
+        self.instring = False
+        self.escaped = False
+
+    def emit(self, piece: str) -> str:
+        self.mode = IDLE
+        if self.pieces:
+            self.pieces.append(piece)
+            piece = "".join(self.pieces)
+            self.pieces = []
+        return piece
+
+    def feed(self, chunk: str) -> List[str]:
+        out: List[str] = []
+        i, n, start = 0, len(chunk), 0
+        while i < n:
+            if self.mode == IDLE:
+                m = _nonws.search(chunk, i)
+                if not m:
+                    break
+                i = start = m.start()
+                c = chunk[i]
+                if c in "{[":
+                    self.mode, self.depth = CONTAINER, 1
+                elif c == '"':
+                    self.mode, self.instring = STRING, True
+                else:
+                    self.mode = SCALAR
+                i += 1
+            elif self.escaped:
+                self.escaped = False
+                i += 1
+            elif self.instring:
+                m = _instring.search(chunk, i)
+                if not m:
+                    break
+                i = m.end()
+                if m.group() == "\\":
+                    self.escaped = True
+                else:
+                    self.instring = False
+                    if self.mode == STRING:
+                        out.append(self.emit(chunk[start:i]))
+            elif self.mode == SCALAR:
+                m = _scalarend.search(chunk, i)
+                if not m:
+                    break
+                i = m.start()
+                out.append(self.emit(chunk[start:i]))
+            else:
+                m = _structural.search(chunk, i)
+                if not m:
+                    break
+                i = m.end()
+                c = m.group()
+                if c == '"':
+                    self.instring = True
+                elif c in "{[":
+                    self.depth += 1
+                else:
+                    self.depth -= 1
+                    if self.depth == 0:
+                        out.append(self.emit(chunk[start:i]))
+        if self.mode != IDLE:
+            self.pieces.append(chunk[start:])
+        return out
+
+    def close(self) -> List[str]:
+        if self.mode == IDLE:
+            return []
+        self.instring = self.escaped = False
+        return [self.emit("")]
+
+
+def iter_texts(fp: "Reader", chunk_size: int = 65536) -> Iterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    splitter = Splitter()
+    while True:
+        data = fp.read(chunk_size)
+        if not data:
+            break
+        if isinstance(data, bytes):
+            data = decoder.decode(data)
+        yield from splitter.feed(data)
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield from splitter.feed(tail)
+    yield from splitter.close()
+
+
+def iter_lines(fp: "Lines") -> Iterator[str]:
+    # NDJSON: every non-blank line is one record.
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    for line in fp:
+        if isinstance(line, bytes):
+            line = decoder.decode(line)
+        if line.strip(" \r\t\n"):
+            yield line
+
+
+def _value(text: str, options: Any) -> Any:
+    val, left = parse(text, **options)
+    if left.strip(" \r\t\n"):
+        raise ParseError("unexpected `%s' after value" % left)
+    return val
+
+
+def iter_values(
+    fp: "Reader", chunk_size: int = 65536, **options: Any
+) -> Iterator[Any]:
+    for text in iter_texts(fp, chunk_size):
+        yield _value(text, options)
+
+
+async def _chunks(
+    reader: "asyncio.StreamReader", chunk_size: int
+) -> AsyncIterator[str]:
+    import asyncio
+
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    while True:
+        data = await reader.read(chunk_size)
+        if not data:
+            tail = decoder.decode(b"", final=True)
+            if tail:
+                yield tail
+            return
+        yield decoder.decode(data)
+        # A buffered reader returns without suspending; let others run.
+        await asyncio.sleep(0)
+
+
+async def _parse(
+    text: str, executor_threshold: Optional[int], options: Any
+) -> Any:
+    import asyncio
+
+    if executor_threshold is not None and len(text) >= executor_threshold:
+        loop = asyncio.get_running_loop()
+        call = functools.partial(_value, text, options)
+        return await loop.run_in_executor(None, call)
+    val = _value(text, options)
+    await asyncio.sleep(0)
+    return val
+
+
+async def parse_stream(
+    reader: "asyncio.StreamReader",
+    chunk_size: int = 65536,
+    executor_threshold: Optional[int] = None,
+    **options: Any
+) -> Any:
+    pieces: List[str] = []
+    async for chunk in _chunks(reader, chunk_size):
+        pieces.append(chunk)
+    return await _parse("".join(pieces), executor_threshold, options)
+
+
+async def aiter_values(
+    reader: "asyncio.StreamReader",
+    chunk_size: int = 65536,
+    executor_threshold: Optional[int] = None,
+    **options: Any
+) -> AsyncIterator[Any]:
+    splitter = Splitter()
+    async for chunk in _chunks(reader, chunk_size):
+        for text in splitter.feed(chunk):
+            yield await _parse(text, executor_threshold, options)
+    for text in splitter.close():
+        yield await _parse(text, executor_threshold, options)
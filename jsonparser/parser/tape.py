@@ -0,0 +1,237 @@
+import mmap
+import struct
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+from .parser import parse
+
+#
+# A tape is a flat, pre-order sequence of fixed-size node records followed
+# by a string table. Every record is 16 bytes: a type tag, a count and an
+# 8-byte payload. Containers store their child count and the index of the
+# first record after their last descendant, which lets readers skip whole
+# subtrees. Object members are stored as a KEY record followed by the value.
+# Strings and keys refer to a deduplicated, UTF-8 encoded string table.
+#
+OBJECT, ARRAY, KEY, STRING, NUMBER, TRUE, FALSE, NULL = range(8)
+
+_MAGIC = b"JPTAPE01"
+_HEADER = struct.Struct("<8sQQQ")
+_NODE = struct.Struct("<IIQ")
+_TAG = struct.Struct("<II")
+_INDEX = struct.Struct("<Q")
+_NUMBER = struct.Struct("<d")
+
+Buffer = Union[bytes, bytearray, mmap.mmap]
+
+
+class TapeError(Exception):
+    def __init__(self, msg: str) -> None:
+        super().__init__("JSON tape: %s" % msg)
+
+
+class TapeBuilder:
+    def __init__(self) -> None:
+        self.nodes = bytearray()
+        self.count = 0
+        self.strings: Dict[str, int] = {}
+        self.offsets: List[int] = [0]
+        self.blob = bytearray()
+
+    def string(self, s: str) -> int:
+        idx = self.strings.get(s)
+        if idx is None:
+            idx = len(self.offsets) - 1
+            self.strings[s] = idx
+            self.blob += s.encode("utf-8")
+            self.offsets.append(len(self.blob))
+        return idx
+
+    def append(self, tag: int, count: int, payload: int) -> int:
+        self.nodes += _NODE.pack(tag, count, payload)
+        self.count += 1
+        return self.count - 1
+
+    def patch(self, idx: int, count: int, payload: int) -> None:
+        tag = _TAG.unpack_from(self.nodes, idx * _NODE.size)[0]
+        _NODE.pack_into(self.nodes, idx * _NODE.size, tag, count, payload)
+
+    def add(self, value: Any) -> None:
+        if isinstance(value, dict):
+            idx = self.append(OBJECT, 0, 0)
+            for k, v in value.items():
+                if not isinstance(k, str):
+                    raise TapeError("object key is not a string: %r" % (k,))
+                self.append(KEY, 0, self.string(k))
+                self.add(v)
+            self.patch(idx, len(value), self.count)
+        elif isinstance(value, list):
+            idx = self.append(ARRAY, 0, 0)
+            for v in value:
+                self.add(v)
+            self.patch(idx, len(value), self.count)
+        elif isinstance(value, str):
+            self.append(STRING, 0, self.string(value))
+        elif value is True:
+            self.append(TRUE, 0, 0)
+        elif value is False:
+            self.append(FALSE, 0, 0)
+        elif value is None:
+            self.append(NULL, 0, 0)
+        elif isinstance(value, (int, float)):
+            # Numbers are stored as doubles, so an int that a double
+            # cannot hold exactly is refused rather than rounded.
+            try:
+                num = float(value)
+            except OverflowError:
+                num = float("nan")
+            if isinstance(value, int) and num != value:
+                raise TapeError("integer %d does not fit a double" % value)
+            bits = _INDEX.unpack(_NUMBER.pack(num))[0]
+            self.append(NUMBER, 0, bits)
+        else:
+            raise TapeError("cannot store %s" % type(value).__name__)
+
+    def build(self) -> bytes:
+        header = _HEADER.pack(
+            _MAGIC, self.count, len(self.offsets) - 1, len(self.blob)
+        )
+        offsets = struct.pack("<%dQ" % len(self.offsets), *self.offsets)
+        return b"".join((header, self.nodes, offsets, self.blob))
+
+
+class Tape:
+    root = 0
+
+    def __init__(self, buf: Buffer) -> None:
+        if len(buf) < _HEADER.size:
+            raise TapeError("truncated header")
+        magic, nodes, strings, bloblen = _HEADER.unpack_from(buf, 0)
+        if magic != _MAGIC:
+            raise TapeError("bad magic %r" % (magic,))
+        self.nodestart = _HEADER.size
+        self.offstart = self.nodestart + nodes * _NODE.size
+        self.blobstart = self.offstart + (strings + 1) * _INDEX.size
+        if len(buf) != self.blobstart + bloblen or nodes == 0:
+            raise TapeError("size mismatch")
+        self.buf = buf
+        self.nodes = nodes
+        self.strings = strings
+
+    @classmethod
+    def from_value(self, value: Any) -> "Tape":
+        builder = TapeBuilder()
+        builder.add(value)
+        return Tape(builder.build())
+
+    @classmethod
+    def load(self, path: str) -> "Tape":
+        with open(path, "rb") as f:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return Tape(buf)
+        except TapeError:
+            buf.close()
+            raise
+
+    def save(self, path: str) -> None:
+        with open(path, "wb") as f:
+            f.write(self.buf)
+
+    def close(self) -> None:
+        if isinstance(self.buf, mmap.mmap):
+            self.buf.close()
+
+    def __enter__(self) -> "Tape":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def _record(self, i: int) -> Tuple[int, int]:
+        if not 0 <= i < self.nodes:
+            raise IndexError("tape index %d out of range" % i)
+        return _TAG.unpack_from(self.buf, self.nodestart + i * _NODE.size)
+
+    def _payload(self, i: int) -> int:
+        off = self.nodestart + i * _NODE.size + 8
+        return _INDEX.unpack_from(self.buf, off)[0]
+
+    def _string(self, idx: int) -> str:
+        a, b = struct.unpack_from(
+            "<QQ", self.buf, self.offstart + idx * _INDEX.size
+        )
+        start = self.blobstart + a
+        return str(memoryview(self.buf)[start : self.blobstart + b], "utf-8")
+
+    def kind(self, i: int) -> int:
+        return self._record(i)[0]
+
+    def size(self, i: int) -> int:
+        return self._record(i)[1]
+
+    def skip(self, i: int) -> int:
+        tag, _ = self._record(i)
+        if tag in (OBJECT, ARRAY):
+            return self._payload(i)
+        if tag == KEY:
+            return self.skip(i + 1)
+        return i + 1
+
+    def value(self, i: int) -> Any:
+        tag, _ = self._record(i)
+        if tag in (STRING, KEY):
+            return self._string(self._payload(i))
+        if tag == NUMBER:
+            off = self.nodestart + i * _NODE.size + 8
+            return _NUMBER.unpack_from(self.buf, off)[0]
+        if tag == TRUE:
+            return True
+        if tag == FALSE:
+            return False
+        if tag == NULL:
+            return None
+        raise TapeError("node %d is a container" % i)
+
+    def children(self, i: int) -> Iterator[int]:
+        tag, n = self._record(i)
+        if tag != ARRAY:
+            raise TapeError("node %d is not an array" % i)
+        cur = i + 1
+        for _ in range(n):
+            yield cur
+            cur = self.skip(cur)
+
+    def items(self, i: int) -> Iterator[Tuple[str, int]]:
+        tag, n = self._record(i)
+        if tag != OBJECT:
+            raise TapeError("node %d is not an object" % i)
+        cur = i + 1
+        for _ in range(n):
+            yield (self._string(self._payload(cur)), cur + 1)
+            cur = self.skip(cur + 1)
+
+    def get(self, i: int, key: str) -> Optional[int]:
+        for k, v in self.items(i):
+            if k == key:
+                return v
+        return None
+
+    def index(self, i: int, n: int) -> int:
+        if not 0 <= n < self.size(i):
+            raise IndexError("array index %d out of range" % n)
+        for j, cur in enumerate(self.children(i)):
+            if j == n:
+                break
+        return cur
+
+    def to_python(self, i: int = 0) -> Any:
+        tag, _ = self._record(i)
+        if tag == OBJECT:
+            return {k: self.to_python(v) for k, v in self.items(i)}
+        if tag == ARRAY:
+            return [self.to_python(c) for c in self.children(i)]
+        return self.value(i)
+
+
+def parse_tape(what: str) -> Tuple[Tape, str]:
+    val, left = parse(what)
+    return (Tape.from_value(val), left)
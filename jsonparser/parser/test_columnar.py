@@ -0,0 +1,49 @@
+import unittest
+from array import array
+from jsonparser.parser import *
+
+
+class TestColumnar(unittest.TestCase):
+    def test_columns(self):
+        m = """[
+            {"value": "New", "onclick": "CreateNewDoc()", "n": 1},
+            {"onclick": "OpenDoc()", "value": "Open", "n": 2.5},
+            {"value": "Close", "onclick": "CloseDoc()", "n": -3}
+        ]"""
+        cols, left = parse_columnar(m)
+        self.assertEqual(left, "")
+        self.assertEqual(list(cols), ["value", "onclick", "n"])
+        self.assertEqual(cols["value"], ["New", "Open", "Close"])
+        self.assertEqual(
+            cols["onclick"], ["CreateNewDoc()", "OpenDoc()", "CloseDoc()"]
+        )
+        self.assertIsInstance(cols["n"], array)
+        self.assertEqual(list(cols["n"]), [1.0, 2.5, -3.0])
+
+    def test_mixed_column(self):
+        cols, _ = parse_columnar('[{"a": 1}, {"a": null}, {"a": 3}]')
+        self.assertEqual(cols["a"], [1.0, None, 3.0])
+        self.assertIsInstance(cols["a"], list)
+
+    def test_empty(self):
+        cols, left = parse_columnar(" [ ] ")
+        self.assertEqual(cols, {})
+        self.assertEqual(left, " ")
+
+    def test_heterogeneous(self):
+        for m in (
+            '[{"a": 1}, {"b": 2}]',
+            '[{"a": 1}, {"a": 2, "b": 3}]',
+            '[{"a": 1, "b": 3}, {"a": 2}]',
+            '[{"a": 1, "a": 2}]',
+            '[{"a": 1}, 2]',
+            "[{}, {}, {}]",
+        ):
+            val, left = parse_columnar(m)
+            self.assertEqual(left, "")
+            self.assertEqual(val, parse(m)[0])
+
+    def test_broken(self):
+        for m in ('[{"a": 1} {"a": 2}]', '[{"a": 1},', '{"a": 1}'):
+            with self.assertRaises(ParseError):
+                parse_columnar(m)
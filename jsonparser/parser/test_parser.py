@@ -16,6 +16,13 @@ class TestParser(unittest.TestCase):
         self.assertEqual(left, "")
         self.assertEqual(n, "abcΔe")
 
+    def test_string_escapes(self):
+        n, left = parse(' "a\\u0394\\/\\t" ')
+        self.assertEqual((n, left), ("a\u0394/\t", " "))
+        for m in ('"\\u+123"', '"\\u12"', '"\\u 1234"', '"\\x"', '"ab\\'):
+            with self.assertRaises(ParseError):
+                parse(m)
+
     def test_string_escaped(self):
         m = r"this is an escaped \"string\""
         p = MatchString()
@@ -62,6 +69,19 @@ class TestParser(unittest.TestCase):
         with self.assertRaises(Error):
             MatchNumber().parse("123.")
 
+    def test_number_overflow(self):
+        for m in ("1e400", "-1e400", "[1%s]" % ("0" * 400)):
+            with self.assertRaises(ParseError):
+                parse(m)
+        self.assertEqual(parse("1e-400")[0], 0.0)
+
+    def test_number_integers(self):
+        n, left = parse("[-12, 0, 1.5, 2e3, %s]" % (10**30), integers=True)
+        self.assertEqual(left, "")
+        self.assertEqual(n, [-12, 0, 1.5, 2000.0, 10**30])
+        self.assertEqual([type(x) for x in n], [int, int, float, float, int])
+        self.assertIs(type(Parser(integers=True).parse("3")[0]), int)
+
     def test_bool(self):
         m = [("true", True, True), ("false", False, True), ("ei", 0, False)]
         p = MatchBool()
@@ -123,3 +143,128 @@ class TestParser(unittest.TestCase):
     def test_array_broken(self):
         with self.assertRaises(Error):
             MatchArray().parse("[ 1")
+
+    def test_object_hook(self):
+        m = '{"a": {"b": 1}, "c": [{"d": 2}]}'
+        n, _ = parse(m, object_hook=lambda d: sorted(d))
+        self.assertEqual(n, ["a", "c"])
+        n, _ = parse(m, object_hook=lambda d: ("obj", d))
+        self.assertEqual(
+            n, ("obj", {"a": ("obj", {"b": 1}), "c": [("obj", {"d": 2})]})
+        )
+
+    def test_object_pairs_hook(self):
+        def nodups(pairs):
+            keys = [k for k, _ in pairs]
+            if len(set(keys)) != len(keys):
+                raise ValueError("duplicate key")
+            return pairs
+
+        n, _ = parse('{"b": 1, "a": [], "c": {}}', object_pairs_hook=nodups)
+        self.assertEqual(n, [("b", 1.0), ("a", []), ("c", [])])
+        with self.assertRaises(ParseError):
+            parse('{"a": 1, "a": 2}', object_pairs_hook=nodups)
+        n, _ = parse(
+            '{"a": 1}', object_hook=dict, object_pairs_hook=lambda p: "pairs"
+        )
+        self.assertEqual(n, "pairs")
+
+    def test_array_hook(self):
+        n, _ = parse('[1, [2, [3]], {"a": []}]', array_hook=tuple)
+        self.assertEqual(n, (1.0, (2.0, (3.0,)), {"a": ()}))
+        n, _ = parse("[1]")
+        self.assertEqual(n, [1.0])
+
+    def test_hook_calls(self):
+        # Every container is parsed once, so its hook runs once.
+        calls = []
+
+        def hook(res):
+            calls.append(res)
+            return res
+
+        parse("[" * 10 + "1" + "]" * 10, array_hook=hook)
+        self.assertEqual(len(calls), 10)
+        calls.clear()
+        parse('{"a": {"b": {"c": [1, 2]}}, "d": {}}', object_pairs_hook=hook)
+        self.assertEqual(len(calls), 4)
+
+    def test_limits(self):
+        m = '{"a": [1, 22, "abc"], "b": {"c": [[]]}}'
+        for limits in (
+            Limits(),
+            Limits(len(m), 8, 4, 3, 2, 10.0),
+        ):
+            self.assertEqual(parse(m, limits=limits), parse(m))
+        for limits in (
+            Limits(max_bytes=len(m) - 1),
+            Limits(max_nodes=7),
+            Limits(max_depth=3),
+            Limits(max_string=2),
+            Limits(max_number=1),
+        ):
+            with self.assertRaises(LimitExceeded):
+                parse(m, limits=limits)
+        with self.assertRaises(LimitExceeded):
+            parse('"ΔΔ"', limits=Limits(max_bytes=5))
+
+    def test_limits_time(self):
+        m = "[%s]" % ", ".join(["1"] * 5000)
+        with self.assertRaises(LimitExceeded):
+            parse(m, limits=Limits(timeout=0.0))
+
+    def test_limits_time_string(self):
+        # A single token must not outlast the budget either.
+        m = '"%s"' % ("\\n" * 200000)
+        with self.assertRaises(LimitExceeded):
+            parse(m, limits=Limits(timeout=0.0))
+        self.assertEqual(parse(m)[0], "\n" * 200000)
+
+    def test_limits_error(self):
+        self.assertTrue(issubclass(LimitExceeded, Error))
+        with self.assertRaises(ParseError):
+            parse("[1,", limits=Limits(max_nodes=10))
+
+    def test_stats(self):
+        m = ' {"a": [1, 2.5e3, "x y"], "b": {"a": [true, null]}, "c": "Δ"} '
+        stats = ParseStats()
+        n, left = parse(m, stats=stats)
+        self.assertEqual((n, left), parse(m))
+        self.assertEqual(stats.documents, 1)
+        self.assertEqual((stats.objects, stats.arrays), (2, 2))
+        self.assertEqual((stats.numbers, stats.bools, stats.nulls), (2, 1, 1))
+        self.assertEqual(stats.strings, 6)
+        self.assertEqual(stats.string_bytes, 9)
+        self.assertEqual(stats.max_string_bytes, 3)
+        self.assertEqual(stats.max_depth, 3)
+        self.assertEqual(dict(stats.keys), {"a": 2, "b": 1, "c": 1})
+        self.assertEqual(stats.whitespace, 10)
+        parse("[[]]", stats=stats)
+        self.assertEqual(stats.documents, 2)
+        self.assertEqual(stats.arrays, 4)
+        self.assertEqual(stats.max_depth, 3)
+
+    def test_stats_failed(self):
+        stats = ParseStats()
+        parse("[1, 2]", stats=stats)
+        with self.assertRaises(ParseError):
+            parse('[1, 2, "abc", {"k": 1', stats=stats)
+        self.assertEqual(stats.documents, 1)
+        self.assertEqual((stats.numbers, stats.strings), (2, 0))
+        self.assertEqual((stats.objects, stats.max_depth), (0, 1))
+        self.assertEqual(stats.keys, {})
+
+    def test_stats_limits(self):
+        stats = ParseStats()
+        parse("[[1]]", limits=Limits(max_nodes=10), stats=stats)
+        self.assertEqual(stats.max_depth, 2)
+        with self.assertRaises(LimitExceeded):
+            parse("[[1]]", limits=Limits(max_depth=1), stats=stats)
+
+    def test_deep_nesting(self):
+        m = "[" * 40 + "]" * 40
+        n, left = parse(m)
+        self.assertEqual(left, "")
+        for _ in range(39):
+            n = n[0]
+        self.assertEqual(n, [])
@@ -0,0 +1,18 @@
+import unittest
+from jsonparser.parser import *
+
+
+class TestPointer(unittest.TestCase):
+    doc = {"a": [{"b/c": 1, "m~n": 2}], "": 3}
+
+    def test_resolve(self):
+        self.assertEqual(resolve(self.doc, ""), self.doc)
+        self.assertEqual(resolve(self.doc, "/a/0/b~1c"), 1)
+        self.assertEqual(resolve(self.doc, "/a/0/m~0n"), 2)
+        self.assertEqual(resolve(self.doc, "/"), 3)
+
+    def test_errors(self):
+        bad = ("a", "/x", "/a/1", "/a/01", "/a/-", "/a/\u00b2", "/a/0/b~1c/d")
+        for p in bad:
+            with self.assertRaises(PointerError):
+                resolve(self.doc, p)
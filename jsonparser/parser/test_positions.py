@@ -0,0 +1,72 @@
+import unittest
+from jsonparser.parser import *
+
+text = """{
+  "name": "x",
+  "list": [1, true,
+           {"a/b": null}],
+  "Δ": "y", "name": 2
+}"""
+
+
+class TestPositions(unittest.TestCase):
+    def test_pointers(self):
+        val, left, table = parse_positions(text)
+        self.assertEqual((val, left), parse(text))
+        self.assertEqual(table.span(""), (0, len(text)))
+        self.assertEqual(table.span("/list/0"), (28, 29))
+        start, end = table.span("/list")
+        self.assertEqual(
+            text[start:end], '[1, true,\n           {"a/b": null}]'
+        )
+        start, end = table.span("/list/2/a~1b")
+        self.assertEqual(text[start:end], "null")
+        # The last of a repeated key is the one in the value.
+        start, end = table.span("/name")
+        self.assertEqual(text[start:end], "2")
+        start, end = table.span("/Δ")
+        self.assertEqual(text[start:end], '"y"')
+        with self.assertRaises(PointerError):
+            table.span("/missing")
+        # Members shadowed by a later duplicate key are not indexed.
+        m = '{"a": {"x": 1}, "b": 0, "a": {"y": [2]}}'
+        val, _, table = parse_positions(m)
+        self.assertEqual(val, {"a": {"y": [2.0]}, "b": 0.0})
+        for pointer in ("/a/x", "/a/y/1"):
+            with self.assertRaises(PointerError):
+                table.span(pointer)
+        self.assertEqual(table.span("/a/y/0"), (36, 37))
+        k = table.key("/a")
+        self.assertEqual(table.starts[k], m.rindex('"a"'))
+        self.assertEqual(
+            sorted(table.index()), ["", "/a", "/a/y", "/a/y/0", "/b"]
+        )
+
+    def test_keys_and_ids(self):
+        _, _, table = parse_positions(text)
+        k = table.key("/list/2/a~1b")
+        self.assertEqual(table.kinds[k], Kind.STRING)
+        self.assertEqual(text[table.starts[k] : table.ends[k]], '"a/b"')
+        self.assertEqual(table.kinds[table.node("/list/1")], Kind.BOOL)
+        self.assertEqual(table.pointer(table.node("/list/2")), "/list/2")
+        with self.assertRaises(PointerError):
+            table.key("/list/0")
+
+    def test_lines(self):
+        _, _, table = parse_positions(text)
+        self.assertEqual(table.start(""), (1, 1))
+        self.assertEqual(table.start("/name"), (5, 21))
+        self.assertEqual(table.start("/list/2/a~1b"), (4, 20))
+        self.assertEqual(table.start("/Δ"), (5, 8))
+        self.assertEqual(table.end(""), (6, 2))
+        self.assertEqual(table.location(1), (1, 2))
+        self.assertEqual(table.location(2), (2, 1))
+
+    def test_scalar_and_options(self):
+        table = PositionTable("  1.5")
+        self.assertEqual(parse("  1.5", spans=table), (1.5, ""))
+        self.assertEqual(table.span(""), (2, 5))
+        p = Parser(array_hook=tuple)
+        val, _, table = parse_positions("[[1], 2]", parser=p)
+        self.assertEqual(val, ((1.0,), 2.0))
+        self.assertEqual(table.span("/0/0"), (2, 3))
@@ -0,0 +1,100 @@
+import unittest
+from jsonparser.parser import *
+from jsonparser.primitives import MatchAll, MatchCharacter
+
+
+class TestSchema(unittest.TestCase):
+    item = Schema(
+        "MenuItem",
+        [Field("value", str), Field("onclick", str, required=False)],
+    )
+    menu = Schema(
+        "Menu",
+        [
+            Field("id", str),
+            Field("width", float),
+            Field("visible", bool, required=False),
+            Field("items", ArrayOf(item)),
+            Field("extra", object, required=False),
+        ],
+    )
+
+    def test_record(self):
+        m = compile_schema(self.menu)
+        rec, left = parse_schema(
+            m,
+            """{"id": "file", "width": 500, "items": [
+                {"value": "New", "onclick": "CreateNewDoc()"},
+                {"value": "Open", "onclick": null}
+            ], "extra": {"a": [1]}}""",
+        )
+        self.assertEqual(left, "")
+        self.assertIsInstance(rec, Record)
+        self.assertEqual(type(rec).__name__, "Menu")
+        self.assertEqual(rec.id, "file")
+        self.assertEqual(rec.width, 500.0)
+        self.assertIsNone(rec.visible)
+        self.assertEqual(rec.extra, {"a": [1.0]})
+        self.assertEqual([i.value for i in rec.items], ["New", "Open"])
+        self.assertEqual(rec.items[0].onclick, "CreateNewDoc()")
+        self.assertIsNone(rec.items[1].onclick)
+        with self.assertRaises(AttributeError):
+            rec.unknown = 1
+
+    def test_namedtuple(self):
+        s = Schema("Point", [Field("x", float), Field("y", float)], True)
+        rec, _ = compile_schema(s).parse('{"y": 2, "x": 1}')
+        self.assertEqual(rec, (1.0, 2.0))
+        self.assertEqual(rec.x, 1.0)
+
+    def test_integer(self):
+        s = Schema("Page", [Field("n", int), Field("ids", ArrayOf(int))])
+        m = compile_schema(s)
+        big = 10**19 + 1
+        rec, _ = parse_schema(m, '{"n": -12, "ids": [0, %d]}' % big)
+        self.assertEqual(rec.n, -12)
+        self.assertIsInstance(rec.n, int)
+        self.assertEqual(rec.ids, [0, big])
+        for bad in ("1.0", "1e3", "01", '"1"'):
+            with self.assertRaises(SchemaError):
+                parse_schema(m, '{"n": %s, "ids": []}' % bad)
+
+    def test_bad_names(self):
+        for name, field in (
+            ("Item", "on-click"),
+            ("Item", "class"),
+            ("Item", "_x"),
+            ("my item", "x"),
+        ):
+            for nt in (False, True):
+                with self.assertRaises(ValueError):
+                    Schema(name, [Field(field, str)], nt)
+
+    def test_mismatch(self):
+        m = compile_schema(self.menu)
+        for bad in (
+            '{"id": 1, "width": 1, "items": []}',
+            '{"id": "a", "width": "1", "items": []}',
+            '{"id": "a", "width": 1}',
+            '{"id": "a", "width": 1, "items": [{"onclick": "x"}]}',
+            '{"id": "a", "width": 1, "items": [1]}',
+            '{"id": "a", "id": "b", "width": 1, "items": []}',
+            '{"id": "a", "width": 1, "items": [], "color": "red"}',
+        ):
+            with self.assertRaises(SchemaError):
+                parse_schema(m, bad)
+
+    def test_extra(self):
+        s = Schema("Item", [Field("value", str)], extra=True)
+        rec, _ = parse_schema(compile_schema(s), '{"x": [1], "value": "v"}')
+        self.assertEqual(rec.value, "v")
+
+    def test_broken(self):
+        with self.assertRaises(ParseError):
+            parse_schema(compile_schema(self.item), '{"value": "x"')
+
+    def test_combinable(self):
+        m = MatchAll(compile_schema(self.item), MatchCharacter(";"))
+        (rec, _), left = m.parse('{"value": "a"};rest')
+        self.assertEqual(rec.value, "a")
+        self.assertEqual(left, "rest")
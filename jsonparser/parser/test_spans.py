@@ -0,0 +1,119 @@
+import unittest
+from jsonparser.parser import *
+from jsonparser.parser.parser import Kind
+
+
+class TestSpans(unittest.TestCase):
+    def test_recorder(self):
+        m = ' {"a": [1, true], "b" : null} '
+        rec = SpanRecorder()
+        val, left = Parser().parse(m, spans=rec)
+        self.assertEqual(left, " ")
+        root = build_spans(rec, m)
+        self.assertEqual(m[root.offset : root.offset + root.length], m.strip())
+        a, b = root.children
+        self.assertEqual((a.key, b.key), ("a", "b"))
+        self.assertEqual(a.kind, Kind.ARRAY)
+        start = root.offset + a.offset
+        self.assertEqual(m[start : start + a.length], "[1, true]")
+        one, true = a.children
+        self.assertEqual((one.kind, one.offset), (Kind.NUMBER, 1))
+        self.assertEqual((true.kind, true.offset), (Kind.BOOL, 4))
+        self.assertEqual(m[root.offset + b.offset :][:4], "null")
+
+    def test_spans_match_text(self):
+        m = '[{"k": "v", "n": -1.5e3}, [], {}, "s", [[false]]]'
+        doc = Document(m)
+
+        def check(val, span, base):
+            start = base + span.offset
+            self.assertEqual(parse(m[start : start + span.length]), (val, ""))
+            for i, c in enumerate(span.children):
+                check(val[i if c.key is None else c.key], c, start)
+
+        check(doc.value, doc.root, 0)
+
+
+class TestDocument(unittest.TestCase):
+    m = '{"name": "cfg", "items": [1, 2, {"deep": [true]}], "n": 5}'
+
+    def check(self, doc):
+        self.assertEqual(doc.value, parse(doc.text)[0])
+        fresh = Document(doc.text)
+
+        def same(a, b):
+            self.assertEqual(
+                (a.kind, a.offset, a.length, a.key),
+                (b.kind, b.offset, b.length, b.key),
+            )
+            self.assertEqual(len(a.children), len(b.children))
+            for x, y in zip(a.children, b.children):
+                same(x, y)
+
+        same(doc.root, fresh.root)
+
+    def test_edit_scalar(self):
+        doc = Document(self.m)
+        items = doc.value["items"]
+        at = self.m.index("2,")
+        doc.edit(at, 1, "42")
+        self.assertEqual(doc.value["items"][1], 42)
+        self.assertIs(doc.value["items"], items)
+        self.check(doc)
+        doc.edit(doc.text.index("5}") + 1, 0, "6")
+        self.assertEqual(doc.value["n"], 56)
+        self.check(doc)
+
+    def test_edit_nested(self):
+        doc = Document(self.m)
+        deep = doc.value["items"][2]
+        at = doc.text.index("true")
+        doc.edit(at, 4, '"x", null')
+        self.assertEqual(doc.value["items"][2]["deep"], ["x", None])
+        self.assertIs(doc.value["items"][2], deep)
+        self.check(doc)
+
+    def test_edit_structure(self):
+        doc = Document(self.m)
+        at = doc.text.index(", 2")
+        doc.edit(at, 0, ', "new"')
+        self.assertEqual(doc.value["items"][:3], [1, "new", 2])
+        self.check(doc)
+        doc.edit(doc.text.index('"name"'), 6, '"title"')
+        self.assertEqual(list(doc.value), ["title", "items", "n"])
+        self.check(doc)
+
+    def test_edit_root(self):
+        doc = Document("[1, 2]")
+        doc.edit(0, 6, '{"a": 1}')
+        self.assertEqual(doc.value, {"a": 1})
+        self.check(doc)
+
+    def test_edit_duplicate_keys(self):
+        for m in (
+            '{"a": [1], "a": [2]}',
+            '{"a": {"x": 1}, "a": {"x": 2}}',
+            '[{"b": {"a": [1], "a": [2]}}]',
+        ):
+            doc = Document(m)
+            doc.edit(m.index("1"), 1, "9")
+            self.assertEqual(doc.value, parse(doc.text)[0])
+            self.check(doc)
+            doc.edit(doc.text.index("2"), 1, "7")
+            self.assertEqual(doc.value, parse(doc.text)[0])
+            self.check(doc)
+
+    def test_many_edits(self):
+        doc = Document(self.m)
+        for i in range(20):
+            at = doc.text.index("[") + 1
+            doc.edit(at, 0, "%d, " % i)
+            self.check(doc)
+        self.assertEqual(doc.value["items"][:3], [19, 18, 17])
+
+    def test_invalid_edit(self):
+        doc = Document(self.m)
+        with self.assertRaises(ParseError):
+            doc.edit(doc.text.index(":"), 1, "")
+        with self.assertRaises(IndexError):
+            doc.edit(len(self.m), 1, "")
@@ -0,0 +1,93 @@
+import asyncio
+import unittest
+from jsonparser.parser import *
+
+
+def reader_for(data: bytes, chunk: int = 3) -> asyncio.StreamReader:
+    reader = asyncio.StreamReader()
+    for i in range(0, len(data), chunk):
+        reader.feed_data(data[i : i + chunk])
+    reader.feed_eof()
+    return reader
+
+
+class TestSplitter(unittest.TestCase):
+    def test_split(self):
+        m = '{"a": "}\\"{"} [1, [2]]\n"s\\\\" 12 true\nnull{"b":{}}-1.5'
+        for size in (1, 2, 5, len(m)):
+            s = Splitter()
+            got = []
+            for i in range(0, len(m), size):
+                got.extend(s.feed(m[i : i + size]))
+            got.extend(s.close())
+            self.assertEqual(
+                got,
+                [
+                    '{"a": "}\\"{"}',
+                    "[1, [2]]",
+                    '"s\\\\"',
+                    "12",
+                    "true",
+                    "null",
+                    '{"b":{}}',
+                    "-1.5",
+                ],
+            )
+
+    def test_unterminated(self):
+        s = Splitter()
+        self.assertEqual(s.feed('  {"a": [1'), [])
+        self.assertEqual(s.close(), ['{"a": [1'])
+
+
+class TestStream(unittest.TestCase):
+    def test_parse_stream(self):
+        async def run():
+            data = '  {"a": [1, 2, "Δ"], "b": null}  '.encode("utf-8")
+            return await parse_stream(reader_for(data), chunk_size=4)
+
+        self.assertEqual(asyncio.run(run()), {"a": [1, 2, "Δ"], "b": None})
+
+    def test_parse_stream_trailing(self):
+        async def run():
+            return await parse_stream(reader_for(b"[1] [2]"))
+
+        with self.assertRaises(ParseError):
+            asyncio.run(run())
+
+    def test_aiter_values(self):
+        async def run():
+            data = b'{"n": 1}\n{"n": 2}\n[3]\n"four"'
+            return [v async for v in aiter_values(reader_for(data), 5)]
+
+        self.assertEqual(asyncio.run(run()), [{"n": 1}, {"n": 2}, [3], "four"])
+
+    def test_hooks_and_executor(self):
+        async def run():
+            data = b"[1, 2] [3]"
+            return [
+                v
+                async for v in aiter_values(
+                    reader_for(data), executor_threshold=4, array_hook=tuple
+                )
+            ]
+
+        self.assertEqual(asyncio.run(run()), [(1, 2), (3,)])
+
+    def test_cooperative(self):
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(1)
+                await asyncio.sleep(0)
+
+        async def run():
+            task = asyncio.create_task(ticker())
+            data = b"[1] " * 20
+            vals = [v async for v in aiter_values(reader_for(data, 8), 8)]
+            task.cancel()
+            return vals
+
+        self.assertEqual(len(asyncio.run(run())), 20)
+        self.assertGreater(len(ticks), 10)
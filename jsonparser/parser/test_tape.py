@@ -0,0 +1,72 @@
+import os
+import tempfile
+import unittest
+from jsonparser.parser import *
+from jsonparser.parser import tape
+
+
+class TestTape(unittest.TestCase):
+    doc = (
+        '{"menu": {"id": "file", "popup": {"menuitem": ['
+        '{"value": "New", "onclick": "CreateNewDoc()"},'
+        '{"value": "Open", "onclick": "OpenDoc()"}]},'
+        '"flags": [true, false, null], "size": -12.5, "ok": "Δ"}}'
+    )
+
+    def test_roundtrip(self):
+        t, left = parse_tape(self.doc)
+        self.assertEqual(left, "")
+        self.assertEqual(t.to_python(), parse(self.doc)[0])
+
+    def test_navigate(self):
+        t, _ = parse_tape(self.doc)
+        self.assertEqual(t.kind(t.root), tape.OBJECT)
+        menu = t.get(t.root, "menu")
+        self.assertEqual(
+            [k for k, _ in t.items(menu)],
+            ["id", "popup", "flags", "size", "ok"],
+        )
+        items = t.get(t.get(menu, "popup"), "menuitem")
+        self.assertEqual(t.kind(items), tape.ARRAY)
+        self.assertEqual(t.size(items), 2)
+        second = t.index(items, 1)
+        self.assertEqual(t.value(t.get(second, "value")), "Open")
+        self.assertEqual(t.value(t.get(menu, "size")), -12.5)
+        self.assertEqual(t.value(t.get(menu, "ok")), "Δ")
+        flags = t.get(menu, "flags")
+        self.assertEqual([t.value(c) for c in t.children(flags)],
+                         [True, False, None])
+        self.assertIsNone(t.get(menu, "missing"))
+
+    def test_strings_deduplicated(self):
+        t = Tape.from_value([{"a": "x"}, {"a": "x"}, {"a": "y"}])
+        self.assertEqual(t.strings, 3)
+
+    def test_save_load(self):
+        t, _ = parse_tape(self.doc)
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "doc.tape")
+            t.save(path)
+            with Tape.load(path) as loaded:
+                self.assertEqual(loaded.to_python(), t.to_python())
+
+    def test_scalar_root(self):
+        t, left = parse_tape('"solo" ')
+        self.assertEqual(left, " ")
+        self.assertEqual(t.to_python(), "solo")
+
+    def test_integers(self):
+        t = Tape.from_value([2**53, -3, 2**63])
+        self.assertEqual(t.to_python(), [2**53, -3, 2**63])
+        for n in (2**53 + 1, 2**63 + 1, 10**400):
+            with self.assertRaises(TapeError):
+                Tape.from_value([n])
+
+    def test_broken(self):
+        with self.assertRaises(TapeError):
+            Tape(b"not a tape at all, certainly not one")
+        with self.assertRaises(TapeError):
+            Tape.from_value({1: 2})
+        t = Tape.from_value([1])
+        with self.assertRaises(TapeError):
+            t.value(t.root)
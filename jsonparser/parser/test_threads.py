@@ -0,0 +1,53 @@
+import threading
+import unittest
+from jsonparser.parser import *
+
+docs = [
+    '{"menu": {"id": "file%d", "items": [%d, [true, null], {"x": "%d"}]}}'
+    % (i, i, i)
+    for i in range(64)
+]
+
+
+class TestThreads(unittest.TestCase):
+    def test_parser_immutable(self):
+        p = Parser(array_hook=tuple)
+        with self.assertRaises(AttributeError):
+            p.array_hook = list
+        with self.assertRaises(AttributeError):
+            p.other = 1
+
+    def test_parse_many_threaded(self):
+        expect = [parse(d) for d in docs]
+        for _ in range(5):
+            self.assertEqual(parse_many_threaded(docs, workers=8), expect)
+        p = Parser(array_hook=tuple)
+        got = parse_many_threaded(docs, workers=4, parser=p)
+        self.assertEqual(got, [p.parse(d) for d in docs])
+
+    def test_concurrent_options(self):
+        # Threads with different hooks must never see each other's options.
+        plain = Parser()
+        tuples = Parser(array_hook=tuple)
+        expect = {
+            id(plain): [plain.parse(d) for d in docs],
+            id(tuples): [tuples.parse(d) for d in docs],
+        }
+        failures = []
+        barrier = threading.Barrier(8)
+
+        def work(p):
+            barrier.wait()
+            for _ in range(10):
+                if [p.parse(d) for d in docs] != expect[id(p)]:
+                    failures.append(p)
+
+        threads = [
+            threading.Thread(target=work, args=(plain if i % 2 else tuples,))
+            for i in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(failures, [])
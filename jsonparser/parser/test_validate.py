@@ -0,0 +1,55 @@
+import unittest
+from jsonparser.parser import *
+
+
+class TestValidate(unittest.TestCase):
+    good = (
+        "{}",
+        "[]",
+        '  { "a" : [1, -2.5, 3e10, 0.5E-3, true, false, null] }  ',
+        '{"a": {"b": {"c": ["\\u0394", "\\n\\"", {}]}}}',
+        '"just a string"',
+        ' "leading space"',
+        "-0",
+        "[1, 2,]",
+        '{"a": 1,}',
+    )
+    bad = (
+        ("", 0),
+        ("{", 1),
+        ("[1 2]", 3),
+        ('{"a" 1}', 5),
+        ("{1: 2}", 1),
+        ('"abc', 0),
+        ('"\\x"', 0),
+        ('"\\u+123"', 0),
+        ('"\\u12"', 0),
+        ("1.", 0),
+        ("tru", 0),
+        ("[1,,2]", 3),
+        ("[,]", 1),
+        ("{} x", 3),
+    )
+
+    def test_good(self):
+        for m in self.good:
+            ok, end = validate(m)
+            self.assertTrue(ok, m)
+            self.assertEqual(end, len(m.rstrip()))
+            self.assertEqual(parse(m)[1].strip(), "")
+
+    def test_bad(self):
+        for m, offset in self.bad:
+            self.assertEqual(validate(m), (False, offset), m)
+            try:
+                self.assertNotEqual(parse(m)[1].strip(), "", m)
+            except ParseError:
+                pass
+
+    def test_incomplete(self):
+        self.assertEqual(validate('{"a": 1} {"b": 2}', False), (True, 8))
+        self.assertEqual(validate('{"a": 1} {"b": 2}'), (False, 9))
+
+    def test_deep(self):
+        m = "[" * 5000 + "]" * 5000
+        self.assertEqual(validate(m), (True, len(m)))
@@ -0,0 +1,106 @@
+import re
+from typing import List, Tuple
+
+#
+# The validator follows the same grammar as the combinators in parser.py,
+# including the tolerance for trailing commas, but works on offsets into the
+# original text and never builds values or slices the input.
+#
+_ws = re.compile(r"[ \t\r\n]*")
+_string = re.compile(r'"(?:[^"\\]|\\(?:["\\/bfnrt]|u[0-9a-fA-F]{4}))*"')
+_number = re.compile(r"-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?")
+_keywords = {"t": "true", "f": "false", "n": "null"}
+_delimiters = "truefalsbo"
+
+
+class Invalid(Exception):
+    def __init__(self, offset: int) -> None:
+        super().__init__("invalid JSON at offset %d" % offset)
+        self.offset = offset
+
+
+def _key(what: str, i: int) -> int:
+    m = _string.match(what, i)
+    if not m:
+        raise Invalid(i)
+    i = _ws.match(what, m.end()).end()
+    if what[i : i + 1] != ":":
+        raise Invalid(i)
+    return _ws.match(what, i + 1).end()
+
+
+def _scalar(what: str, i: int) -> int:
+    c = what[i : i + 1]
+    if c == '"':
+        m = _string.match(what, i)
+    elif c and c in "-0123456789":
+        m = _number.match(what, i)
+        # Like MatchNumber, reject a dangling fraction or exponent.
+        if m:
+            num, nxt = m.group(0), what[m.end() : m.end() + 1]
+            if nxt == "." and num.lstrip("-").isdigit():
+                m = None
+            elif nxt in ("e", "E") and "e" not in num and "E" not in num:
+                m = None
+    elif c in _keywords:
+        kw = _keywords[c]
+        end = i + len(kw)
+        nxt = what[end : end + 1]
+        if what.startswith(kw, i) and (not nxt or nxt not in _delimiters):
+            return end
+        m = None
+    else:
+        m = None
+    if not m:
+        raise Invalid(i)
+    return m.end()
+
+
+def _value(what: str, i: int) -> int:
+    stack: List[str] = []
+    i = _ws.match(what, i).end()
+    while True:
+        c = what[i : i + 1]
+        if c == "{" or c == "[":
+            close = "}" if c == "{" else "]"
+            i = _ws.match(what, i + 1).end()
+            if what[i : i + 1] == close:
+                i += 1
+            else:
+                stack.append(close)
+                if close == "}":
+                    i = _key(what, i)
+                continue
+        else:
+            i = _scalar(what, i)
+        while stack:
+            i = _ws.match(what, i).end()
+            c = what[i : i + 1]
+            if c == ",":
+                i = _ws.match(what, i + 1).end()
+                if what[i : i + 1] == stack[-1]:
+                    stack.pop()
+                    i += 1
+                    continue
+                if stack[-1] == "}":
+                    i = _key(what, i)
+                break
+            elif c and c == stack[-1]:
+                stack.pop()
+                i += 1
+            else:
+                raise Invalid(i)
+        if not stack:
+            return i
+
+
+def validate(what: str, complete: bool = True) -> Tuple[bool, int]:
+    try:
+        i = _value(what, 0)
+    except Invalid as e:
+        return (False, e.offset)
+    if complete:
+        end = _ws.match(what, i).end()
+        if end != len(what):
+            return (False, end)
+    return (True, i)
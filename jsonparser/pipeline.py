@@ -0,0 +1,179 @@
+import functools
+import os
+from collections import deque
+from itertools import islice
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Deque,
+    Iterable,
+    Iterator,
+    List,
+    Union,
+)
+from jsonparser.encoder import Encoder
+from jsonparser.parser import PointerError, iter_lines, iter_texts, resolve
+from jsonparser.parser import split_pointer
+from jsonparser.parser.stream import _value
+
+if TYPE_CHECKING:  # pragma: no cover
+    from concurrent.futures import Future
+
+Source = Union[str, "os.PathLike[str]", IO[str], IO[bytes]]
+
+
+def batches(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    it = iter(items)
+    while True:
+        batch = list(islice(it, size))
+        if not batch:
+            return
+        yield batch
+
+
+def run_parallel(
+    fn: Callable[[List[Any]], List[Any]],
+    items: Iterable[Any],
+    workers: int,
+    batch: int,
+) -> Iterator[Any]:
+    # Keep a bounded number of batches in flight so that input is read
+    # only as fast as the workers consume it, and results stay in order.
+    from concurrent.futures import ProcessPoolExecutor
+
+    pending: Deque["Future"] = deque()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for items_batch in batches(items, batch):
+            pending.append(pool.submit(fn, items_batch))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+class Stage:
+    #
+    # A stage turns an iterator of records into another one. Stages are
+    # lazy: nothing is read until a sink, or the caller, pulls records
+    # through. `a | b' chains two stages into one, and a stage chained
+    # to a sink makes a sink.
+    #
+    def __init__(self, fn: Callable[[Iterator[Any]], Iterator[Any]]) -> None:
+        self.fn = fn
+
+    def __call__(self, items: Iterator[Any]) -> Iterator[Any]:
+        return self.fn(items)
+
+    def __or__(self, other: Any) -> Any:
+        if isinstance(other, Sink):
+            return Sink(lambda items: other.drain(self(items)))
+        return Stage(lambda items: other(self(items)))
+
+
+class Sink:
+    def __init__(self, fn: Callable[[Iterator[Any]], Any]) -> None:
+        self.fn = fn
+
+    def drain(self, items: Iterator[Any]) -> Any:
+        return self.fn(items)
+
+
+class Pipe:
+    def __init__(self, items: Iterable[Any]) -> None:
+        self.items = items
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.items)
+
+    def __or__(self, other: Any) -> Any:
+        if isinstance(other, Sink):
+            return other.drain(iter(self.items))
+        return Pipe(other(iter(self.items)))
+
+
+def _parse_batch(options: Any, texts: List[str]) -> List[Any]:
+    return [_value(text, options) for text in texts]
+
+
+def _map_batch(fn: Callable[[Any], Any], items: List[Any]) -> List[Any]:
+    return [fn(item) for item in items]
+
+
+def _texts(source: Source, ndjson: bool, chunk_size: int) -> Iterator[str]:
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as fp:
+            yield from _texts(fp, ndjson, chunk_size)
+    elif ndjson:
+        yield from iter_lines(source)
+    else:
+        yield from iter_texts(source, chunk_size)
+
+
+def records(
+    source: Source,
+    ndjson: bool = False,
+    chunk_size: int = 65536,
+    workers: int = 0,
+    batch: int = 256,
+    **options: Any
+) -> Pipe:
+    texts = _texts(source, ndjson, chunk_size)
+    if workers > 1:
+        parse = functools.partial(_parse_batch, options)
+        return Pipe(run_parallel(parse, texts, workers, batch))
+    return Pipe(_value(text, options) for text in texts)
+
+
+def select(pointer: str) -> Stage:
+    # Records that do not have the path are dropped, but a malformed
+    # pointer is reported here rather than dropping every record.
+    split_pointer(pointer)
+
+    def run(items: Iterator[Any]) -> Iterator[Any]:
+        for item in items:
+            try:
+                yield resolve(item, pointer)
+            except PointerError:
+                pass
+
+    return Stage(run)
+
+
+def filter(pred: Callable[[Any], Any]) -> Stage:
+    return Stage(lambda items: (item for item in items if pred(item)))
+
+
+def map(fn: Callable[[Any], Any], workers: int = 0, batch: int = 256) -> Stage:
+    # With workers, fn runs in a process pool and so has to be picklable.
+    if workers > 1:
+        work = functools.partial(_map_batch, fn)
+        return Stage(lambda items: run_parallel(work, items, workers, batch))
+    return Stage(lambda items: (fn(item) for item in items))
+
+
+def sink(fn: Callable[[Any], Any]) -> Sink:
+    def run(items: Iterator[Any]) -> int:
+        n = 0
+        for item in items:
+            fn(item)
+            n += 1
+        return n
+
+    return Sink(run)
+
+
+def write(fp: IO[str], encoder: Any = None) -> Sink:
+    # One compact record per line, written as soon as it is ready.
+    enc = encoder if encoder else Encoder()
+
+    def put(item: Any) -> None:
+        fp.write(enc.dumps(item))
+        fp.write("\n")
+
+    return sink(put)
+
+
+def collect() -> Sink:
+    return Sink(list)
@@ -0,0 +1,75 @@
+import io
+import unittest
+from unittest import mock
+from jsonparser.cli import Job, main
+
+
+def run(argv, data):
+    out, err = io.StringIO(), io.StringIO()
+    status = main(argv, io.BytesIO(data.encode("utf-8")), out, err)
+    return (status, out.getvalue(), err.getvalue())
+
+
+class TestCli(unittest.TestCase):
+    records = '{"a": "multi\nline", "b": [1,\n 2]}\n{"a": {"x": 3}}  "Δ"'
+
+    def test_pprint(self):
+        status, out, err = run([], self.records)
+        self.assertEqual(status, 0)
+        self.assertEqual(
+            out,
+            "{'a': 'multi\\nline', 'b': [1.0, 2.0]}\n{'a': {'x': 3.0}}\n'Δ'\n",
+        )
+        self.assertEqual(err, "")
+
+    def test_compact_select(self):
+        status, out, _ = run(["-c", "--select", "/a"], self.records)
+        self.assertEqual(status, 0)
+        self.assertEqual(out, '"multi\\nline"\n{"x":3.0}\n')
+
+    def test_bad_select(self):
+        with mock.patch("sys.stderr", io.StringIO()) as stderr:
+            with self.assertRaises(SystemExit):
+                run(["--select", "a"], self.records)
+        self.assertIn("must start with '/'", stderr.getvalue())
+
+    def test_ndjson(self):
+        data = '{"n": 1}\n\n{"n": [2]}\n{"n": \n'
+        status, out, err = run(["--ndjson"], data)
+        self.assertEqual(status, 1)
+        self.assertEqual(out, '{"n":1.0}\n{"n":[2.0]}\n')
+        self.assertTrue(err.startswith("record 3: "))
+
+    def test_validate_only(self):
+        status, out, err = run(["--validate-only"], '[1] [1 2] {"a": 1}')
+        self.assertEqual(status, 1)
+        self.assertEqual(out, "")
+        self.assertEqual(err, "record 2: invalid JSON at offset 3\n")
+
+    def test_workers(self):
+        data = "".join('{"i": %d}\n' % i for i in range(50))
+        status, out, _ = run(["--ndjson", "-w", "2", "--batch", "7"], data)
+        self.assertEqual(status, 0)
+        self.assertEqual(
+            out, "".join('{"i":%d.0}\n' % i for i in range(50))
+        )
+
+    def test_bad_record_continues(self):
+        for argv in (["-c"], ["--ndjson", "-w", "2"]):
+            status, out, err = run(argv, "1e400\n[1]\n")
+            self.assertEqual(status, 1)
+            self.assertEqual(out, "[1.0]\n")
+            self.assertTrue(err.startswith("record 1: "))
+
+    def test_encode_error(self):
+        job = Job(None, True, False)
+        with mock.patch("jsonparser.cli.parse", return_value=(1e999, "")):
+            ok, line = job.one("1")
+        self.assertFalse(ok)
+        self.assertIn("not representable", line)
+
+    def test_stats(self):
+        status, _, err = run(["--stats", "--validate-only"], "[1] [2]")
+        self.assertEqual(status, 0)
+        self.assertIn("2 records, 7 bytes", err)
+        self.assertIn("MB/s", err)
@@ -0,0 +1,67 @@
+import io
+import os
+import tempfile
+import unittest
+from jsonparser import pipeline
+from jsonparser.parser import PointerError
+from jsonparser.pipeline import collect, records, select, sink, write
+
+
+def double(x):
+    return x * 2
+
+
+class TestPipeline(unittest.TestCase):
+    data = '{"a": {"n": 1}} {"b": 2}\n[3] {"a": {"n": 4}}'
+
+    def test_chain(self):
+        got = (
+            records(io.BytesIO(self.data.encode("utf-8")))
+            | select("/a/n")
+            | pipeline.filter(lambda n: n > 1)
+            | pipeline.map(double)
+            | collect()
+        )
+        self.assertEqual(got, [8.0])
+
+    def test_stages(self):
+        stage = select("/a") | pipeline.map(lambda a: a["n"])
+        self.assertEqual(
+            records(io.StringIO(self.data)) | stage | collect(), [1.0, 4.0]
+        )
+        out = io.StringIO()
+        n = records(io.StringIO(self.data)) | stage | write(out)
+        self.assertEqual(n, 2)
+        self.assertEqual(out.getvalue(), "1.0\n4.0\n")
+
+    def test_lazy(self):
+        seen = []
+        stream = iter(['{"i": %d}\n' % i for i in range(10)])
+        p = records(stream, ndjson=True) | pipeline.map(seen.append)
+        self.assertEqual(seen, [])
+        self.assertEqual(next(iter(p)), None)
+        self.assertEqual(seen, [{"i": 0.0}])
+
+    def test_bad_pointer(self):
+        with self.assertRaises(PointerError):
+            select("a")
+
+    def test_ndjson_path(self):
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "in.ndjson")
+            with open(path, "w") as fp:
+                fp.write('{"i": 1}\n\n{"i": "Δ"}\n')
+            got = []
+            n = records(path, ndjson=True) | select("/i") | sink(got.append)
+        self.assertEqual(n, 2)
+        self.assertEqual(got, [1.0, "Δ"])
+
+    def test_workers(self):
+        data = "".join("[%d]\n" % i for i in range(40))
+        got = (
+            records(io.StringIO(data), ndjson=True, workers=2, batch=3)
+            | select("/0")
+            | pipeline.map(double, workers=2, batch=5)
+            | collect()
+        )
+        self.assertEqual(got, [2.0 * i for i in range(40)])